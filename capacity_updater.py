@@ -13,21 +13,49 @@ Event-driven architecture:
 Author: JMU Development Team
 """
 
-import json
+import hashlib
 import os
+import random
+import time
+import zlib
 import boto3
+import orjson
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from datetime import datetime
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
 import logging
 
-# Configure logging
+# Configure logging (set LOG_LEVEL=WARNING in production to skip
+# per-invocation INFO records)
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO').upper())
 
-# Initialize DynamoDB client
-dynamodb = boto3.resource('dynamodb')
+# Reuse TCP/TLS connections across warm invocations. Adaptive retries
+# rate-limit the client when DynamoDB throttles instead of retrying in a burst.
+boto_config = Config(
+    tcp_keepalive=True,
+    max_pool_connections=10,
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+)
+
+# Initialize DynamoDB client. The low-level client skips the resource
+# layer's Decimal/TypeSerializer conversions on the hot update path, so
+# attribute values are passed pre-serialized ({'S': ...}, {'N': ...}).
+client = boto3.client('dynamodb', config=boto_config)
 table_name = os.environ.get('DYNAMODB_TABLE', 'urec-capacity')
-table = dynamodb.Table(table_name)
+deserializer = TypeDeserializer()
+
+# Counter shards per area. With more than one shard, deltas are written to
+# AREA#<area_id>#<n> items (summed on read) to spread hot-area writes
+# across partitions. Must match COUNTER_SHARDS on the FastAPI backend.
+COUNTER_SHARDS = max(1, int(os.environ.get('COUNTER_SHARDS', '1')))
+
+# Areas whose METADATA item has been seen, kept across warm invocations so
+# updates that can't check it in a condition only look it up once
+_known_areas = set()
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -41,6 +69,9 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     Returns:
         dict: Response with statusCode and body
     
+    Batched events ({"Records": [...]}, e.g. from SQS) are handled by
+    process_records instead.
+    
     Expected event structure:
     {
         "body": {
@@ -51,14 +82,27 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         }
     }
     """
+    # Short-circuit scheduled warmup pings before any request handling
+    if is_warmup_event(event):
+        return warmup_handler(event, context)
+    
+    # Timestamps shared by the DynamoDB update and the response. last_updated
+    # is stored as epoch milliseconds, which is cheaper to produce and
+    # serialize than an ISO string and sorts numerically.
+    now_ms = int(time.time() * 1000)
+    now_iso = datetime.utcnow().isoformat()
+    
+    # SQS (or other batched) triggers deliver several events at once
+    if 'Records' in event:
+        return process_records(event['Records'], now_ms)
+    
     try:
-        logger.info(f"Received event: {json.dumps(event)}")
-        
         # Parse the event body
         # Event structure depends on how API Gateway is configured
         if isinstance(event.get('body'), str):
-            # If body is a JSON string, parse it
-            body = json.loads(event['body'])
+            # If body is a JSON string, parse it (orjson is a C extension,
+            # several times faster than the stdlib decoder)
+            body = orjson.loads(event['body'])
         else:
             # If body is already a dict, use it directly
             body = event.get('body', event)
@@ -69,19 +113,17 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         count = body.get('count', 1)
         client_timestamp = body.get('timestamp')
         
-        # Validate required parameters
-        if not area_id:
-            return create_error_response(400, "Missing required parameter: area_id")
-        
-        if action not in ['enter', 'exit']:
-            return create_error_response(400, "Action must be 'enter' or 'exit'")
+        logger.debug("Received event", extra={'area_id': area_id, 'action': action})
         
-        # Validate count
-        if not isinstance(count, int) or count < 1 or count > 10:
-            return create_error_response(400, "Count must be an integer between 1 and 10")
+        # Validate parameters
+        error = validate_update(area_id, action, count)
+        if error:
+            return create_error_response(400, error, now_iso)
         
         # Update capacity in DynamoDB
-        result = update_capacity(area_id, action, count)
+        result = update_capacity(area_id, action, count, now_ms)
+        if result is None:
+            return create_error_response(404, f"Area not found: {area_id}", now_iso)
         
         # Return success response
         return {
@@ -92,23 +134,356 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 'Access-Control-Allow-Headers': 'Content-Type',
                 'Access-Control-Allow-Methods': 'POST, OPTIONS'
             },
-            'body': json.dumps({
+            'body': orjson.dumps({
                 'success': True,
                 'area_id': area_id,
                 'action': action,
                 'count': count,
                 'new_count': result['current_count'],
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': now_iso,
                 'client_timestamp': client_timestamp
-            })
+            }).decode()
         }
         
     except Exception as e:
         logger.error(f"Error processing event: {str(e)}", exc_info=True)
-        return create_error_response(500, f"Internal server error: {str(e)}")
+        logger.error(f"Failed event: {orjson.dumps(event, default=str).decode()}")
+        return create_error_response(500, f"Internal server error: {str(e)}", now_iso)
+
+
+def validate_update(area_id: Any, action: Any, count: Any) -> Optional[str]:
+    """
+    Validate the parameters of an entry/exit event
+    
+    Args:
+        area_id: Area identifier
+        action: Lower-cased action
+        count: Number of people
+    
+    Returns:
+        str: Error message, or None if the parameters are valid
+    """
+    if not area_id:
+        return "Missing required parameter: area_id"
+    
+    if action not in ['enter', 'exit']:
+        return "Action must be 'enter' or 'exit'"
+    
+    if not isinstance(count, int) or count < 1 or count > 10:
+        return "Count must be an integer between 1 and 10"
+    
+    return None
+
+
+def process_records(records: List[Dict[str, Any]], timestamp: int) -> Dict[str, Any]:
+    """
+    Apply a batch of entry/exit events with TransactWriteItems
+    
+    Events are coalesced into one net delta per area, so a batch costs one
+    transaction (up to 100 areas each) instead of one UpdateItem per event.
+    Invalid records (bad JSON, action or count) are logged and dropped,
+    since a retry would fail the same way. Records for unknown areas and
+    records whose transaction failed are reported back as batch item
+    failures. SQS retries those messages and, after the queue's maxReceiveCount, moves
+    them to its dead-letter queue (see SQSEventSource in lambda_config.json).
+    
+    Each transaction's ClientRequestToken is derived from its message IDs,
+    so a retried call for the same messages isn't applied twice.
+    
+    Args:
+        records: Event records (SQS messages or plain event bodies)
+        timestamp: Time of the update in epoch milliseconds (SQS messages
+            use their SentTimestamp instead, so retries send the same values)
+    
+    Returns:
+        dict: SQS partial batch response ({"batchItemFailures": [...]})
+    
+    Raises:
+        Exception: If a DynamoDB transaction fails for records without a
+            messageId (which can't be reported individually)
+    """
+    deltas = {}
+    events = {}
+    messages = {}
+    sent = {}
+    failures = []
+    
+    for record in records:
+        body = record.get('body', record)
+        try:
+            if isinstance(body, str):
+                body = orjson.loads(body)
+            area_id = body.get('area_id')
+            action = str(body.get('action', 'enter')).lower()
+            count = body.get('count', 1)
+        except (orjson.JSONDecodeError, AttributeError):
+            area_id = action = count = None
+        
+        error = validate_update(area_id, action, count)
+        if error:
+            logger.warning(f"Dropping invalid record {record.get('messageId')}: {error}")
+            continue
+        
+        deltas[area_id] = deltas.get(area_id, 0) + (count if action == 'enter' else -count)
+        events[area_id] = events.get(area_id, 0) + 1
+        messages.setdefault(area_id, []).append(record.get('messageId'))
+        sent_timestamp = record.get('attributes', {}).get('SentTimestamp')
+        if sent_timestamp is not None:
+            sent[area_id] = max(sent.get(area_id, 0), int(sent_timestamp))
+    
+    # Updates can't create areas, so records for unknown ones fail instead
+    for area_id in [a for a in deltas if not area_exists(a)]:
+        logger.warning(f"Skipping records for unknown area {area_id}")
+        failures.extend({'itemIdentifier': m} for m in messages[area_id] if m)
+        del deltas[area_id]
+    
+    # TransactWriteItems accepts at most 100 actions per call
+    area_ids = list(deltas)
+    for start in range(0, len(area_ids), 100):
+        chunk = area_ids[start:start + 100]
+        message_ids = [m for a in chunk for m in messages[a]]
+        
+        # Without message IDs the call can't be made idempotent or its
+        # records reported, so the whole batch fails and is retried
+        if not all(message_ids):
+            write_deltas(
+                {a: deltas[a] for a in chunk}, events,
+                {a: sent.get(a, timestamp) for a in chunk}
+            )
+            continue
+        
+        try:
+            write_deltas(
+                {a: deltas[a] for a in chunk}, events,
+                {a: sent.get(a, timestamp) for a in chunk},
+                _request_token(message_ids)
+            )
+        except Exception as e:
+            # Only this chunk's messages are retried; earlier chunks are done
+            logger.error(f"Error writing batch of {len(chunk)} areas: {str(e)}")
+            failures.extend({'itemIdentifier': m} for m in message_ids)
+    
+    logger.info(f"Processed {len(records)} records across {len(deltas)} areas")
+    return {'batchItemFailures': failures}
+
+
+def _request_token(message_ids: List[str], suffix: str = '') -> str:
+    """ClientRequestToken (at most 36 characters) for a set of SQS messages"""
+    digest = hashlib.sha256(''.join(sorted(message_ids)).encode() + suffix.encode())
+    return digest.hexdigest()[:36]
+
+
+def write_deltas(
+    deltas: Dict[str, int],
+    events: Dict[str, int],
+    timestamps: Dict[str, int],
+    token: Optional[str] = None
+):
+    """
+    Write net deltas for up to 100 areas in one transaction
+    
+    Unsharded exits are conditional decrements, as in update_capacity. If
+    any would take a count below zero, the transaction is cancelled and
+    written again with those areas clamped to zero.
+    
+    Args:
+        deltas: Net change per area
+        events: Number of events per area
+        timestamps: last_updated (epoch milliseconds) per area
+        token: ClientRequestToken, or None for a non-idempotent call
+    """
+    def transact(clamped, request_token):
+        items = [
+            {'Update': _delta_update(
+                area_id, delta, events[area_id], timestamps[area_id],
+                request_token, area_id in clamped
+            )}
+            for area_id, delta in deltas.items()
+        ]
+        kwargs = {'ClientRequestToken': request_token} if request_token else {}
+        client.transact_write_items(TransactItems=items, **kwargs)
+    
+    try:
+        transact(set(), token)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        reasons = e.response.get('CancellationReasons', [])
+        clamped = {
+            area_id
+            for area_id, reason in zip(deltas, reasons)
+            if reason.get('Code') == 'ConditionalCheckFailed'
+        }
+        if not clamped:
+            raise
+        
+        for area_id in clamped:
+            logger.warning(f"Exit would make count negative for {area_id}, clamping to 0")
+        transact(clamped, token and _request_token([token], 'clamp'))
+
+
+def _delta_update(
+    area_id: str,
+    delta: int,
+    events: int,
+    timestamp: int,
+    token: Optional[str],
+    clamp: bool
+) -> Dict[str, Any]:
+    """
+    TransactWriteItems Update action applying an area's net delta
+    
+    Args:
+        area_id: Area identifier
+        delta: Net change in count
+        events: Number of events coalesced into the delta
+        timestamp: last_updated value (epoch milliseconds)
+        token: Request token; picks the counter shard so a retry with the
+            same token sends the same request
+        clamp: Set the count to zero instead (unsharded exits that would
+            go below zero)
+    
+    Returns:
+        dict: Update action
+    """
+    values = {
+        ':events': {'N': str(events)},
+        ':timestamp': {'N': str(timestamp)}
+    }
+    
+    if COUNTER_SHARDS > 1:
+        # Sharded totals can dip below zero and are clamped on read
+        if token:
+            shard = zlib.crc32(f"{token}{area_id}".encode()) % COUNTER_SHARDS
+        else:
+            shard = random.randrange(COUNTER_SHARDS)
+        values.update({':area_id': {'S': area_id}, ':inc': {'N': str(delta)}})
+        return {
+            'TableName': table_name,
+            'Key': {'PK': {'S': f"AREA#{area_id}#{shard}"}, 'SK': {'S': 'COUNTER'}},
+            'UpdateExpression': (
+                "SET area_id = :area_id, last_updated = :timestamp "
+                "ADD current_count :inc, update_count :events"
+            ),
+            'ExpressionAttributeValues': values
+        }
+    
+    update = {
+        'TableName': table_name,
+        'Key': {'PK': {'S': f"AREA#{area_id}"}, 'SK': {'S': 'METADATA'}},
+        'ConditionExpression': "attribute_exists(PK)",
+        'ExpressionAttributeValues': values
+    }
+    
+    if clamp:
+        values[':zero'] = {'N': '0'}
+        update['UpdateExpression'] = (
+            "SET current_count = :zero, last_updated = :timestamp "
+            "ADD update_count :events"
+        )
+    elif delta >= 0:
+        values.update({':zero': {'N': '0'}, ':inc': {'N': str(delta)}})
+        update['UpdateExpression'] = (
+            "SET current_count = if_not_exists(current_count, :zero) + :inc, "
+            "last_updated = :timestamp "
+            "ADD update_count :events"
+        )
+    else:
+        # Decrement only if the count stays non-negative
+        values[':dec'] = {'N': str(-delta)}
+        update['UpdateExpression'] = (
+            "SET current_count = current_count - :dec, last_updated = :timestamp "
+            "ADD update_count :events"
+        )
+        update['ConditionExpression'] = "current_count >= :dec"
+    
+    return update
+
+
+@lru_cache(maxsize=None)
+def _update_template(action: str, count: int) -> Dict[str, Any]:
+    """
+    Build the UpdateItem request shape for an action/count pair once
+    
+    Only the key and timestamp vary between calls with the same action and
+    count, so the expression strings and serialized values are reused. The
+    returned dict is shared; callers must copy before adding values.
+    
+    Args:
+        action: 'enter' or 'exit'
+        count: Number of people
+    
+    Returns:
+        dict: {'Request': fixed request args, 'ExpressionAttributeValues': values}
+    """
+    if action == 'enter':
+        # Update item with atomic counter
+        return {
+            'Request': {
+                'TableName': table_name,
+                'UpdateExpression': (
+                    "SET current_count = if_not_exists(current_count, :zero) + :cnt, "
+                    "last_updated = :timestamp "
+                    "ADD update_count :one"
+                ),
+                # Reject unknown areas instead of creating a stub item
+                'ConditionExpression': "attribute_exists(PK)",
+                'ReturnValues': 'UPDATED_NEW',
+                'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+            },
+            'ExpressionAttributeValues': {
+                ':cnt': {'N': str(count)},
+                ':zero': {'N': '0'},
+                ':one': {'N': '1'}
+            }
+        }
+    
+    # Decrement only if the count stays non-negative, so the common path
+    # needs a single round trip
+    return {
+        'Request': {
+            'TableName': table_name,
+            'UpdateExpression': (
+                "SET current_count = current_count - :cnt, "
+                "last_updated = :timestamp "
+                "ADD update_count :one"
+            ),
+            'ConditionExpression': "current_count >= :cnt",
+            'ReturnValues': 'UPDATED_NEW',
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+        },
+        'ExpressionAttributeValues': {
+            ':cnt': {'N': str(count)},
+            ':one': {'N': '1'}
+        }
+    }
+
+
+# Clamp a would-be-negative count to zero (rare path)
+_CLAMP_TEMPLATE = {
+    'Request': {
+        'TableName': table_name,
+        'UpdateExpression': (
+            "SET current_count = :zero, "
+            "last_updated = :timestamp "
+            "ADD update_count :one"
+        ),
+        'ConditionExpression': "attribute_exists(PK)",
+        'ReturnValues': 'UPDATED_NEW'
+    },
+    'ExpressionAttributeValues': {
+        ':zero': {'N': '0'},
+        ':one': {'N': '1'}
+    }
+}
 
 
-def update_capacity(area_id: str, action: str, count: int = 1) -> Dict[str, Any]:
+def update_capacity(
+    area_id: str,
+    action: str,
+    count: int = 1,
+    timestamp: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
     """
     Update capacity count in DynamoDB using atomic operations
     
@@ -116,9 +491,10 @@ def update_capacity(area_id: str, action: str, count: int = 1) -> Dict[str, Any]
         area_id: Area identifier
         action: 'enter' to increment, 'exit' to decrement
         count: Number of people (default: 1)
+        timestamp: Time of the update in epoch milliseconds (default: now)
     
     Returns:
-        dict: Updated item attributes
+        dict: Updated item attributes, or None if the area doesn't exist
     
     Raises:
         Exception: If DynamoDB update fails
@@ -128,43 +504,50 @@ def update_capacity(area_id: str, action: str, count: int = 1) -> Dict[str, Any]
         pk = f"AREA#{area_id}"
         sk = "METADATA"
         
-        # Determine increment value
-        increment = count if action == 'enter' else -count
+        timestamp = timestamp or int(time.time() * 1000)
         
-        logger.info(f"Updating {area_id}: {action} by {count} (increment: {increment})")
+        logger.info(f"Updating {area_id}: {action} by {count}")
         
-        # Update item with atomic counter
-        response = table.update_item(
-            Key={
-                'PK': pk,
-                'SK': sk
-            },
-            UpdateExpression=(
-                "SET current_count = if_not_exists(current_count, :zero) + :inc, "
-                "last_updated = :timestamp "
-                "ADD update_count :one"
-            ),
-            ExpressionAttributeValues={
-                ':inc': increment,
-                ':zero': 0,
-                ':one': 1,
-                ':timestamp': datetime.utcnow().isoformat()
-            },
-            ReturnValues='ALL_NEW'
-        )
+        if COUNTER_SHARDS > 1:
+            return update_sharded_capacity(area_id, action, count, timestamp)
         
-        updated_item = response['Attributes']
+        key = {'PK': {'S': pk}, 'SK': {'S': sk}}
+        timestamp_value = {'N': str(timestamp)}
         
-        # Ensure count doesn't go below zero
-        if updated_item['current_count'] < 0:
-            logger.warning(f"Negative count detected for {area_id}, resetting to 0")
-            response = table.update_item(
-                Key={'PK': pk, 'SK': sk},
-                UpdateExpression="SET current_count = :zero",
-                ExpressionAttributeValues={':zero': 0},
-                ReturnValues='ALL_NEW'
+        template = _update_template(action, count)
+        try:
+            response = client.update_item(
+                Key=key,
+                ExpressionAttributeValues={
+                    **template['ExpressionAttributeValues'],
+                    ':timestamp': timestamp_value
+                },
+                **template['Request']
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            if 'Item' not in e.response:
+                logger.warning(f"Area not found: {area_id}")
+                return None
+            
+            # Ensure count doesn't go below zero
+            logger.warning(f"Exit would make count negative for {area_id}, clamping to 0")
+            response = client.update_item(
+                Key=key,
+                ExpressionAttributeValues={
+                    **_CLAMP_TEMPLATE['ExpressionAttributeValues'],
+                    ':timestamp': timestamp_value
+                },
+                **_CLAMP_TEMPLATE['Request']
             )
-            updated_item = response['Attributes']
+        
+        attributes = response['Attributes']
+        updated_item = {
+            'current_count': int(attributes['current_count']['N']),
+            'last_updated': int(attributes['last_updated']['N']),
+            'update_count': int(attributes['update_count']['N'])
+        }
         
         logger.info(f"Successfully updated {area_id}: new count = {updated_item['current_count']}")
         return updated_item
@@ -174,13 +557,139 @@ def update_capacity(area_id: str, action: str, count: int = 1) -> Dict[str, Any]
         raise
 
 
-def create_error_response(status_code: int, message: str) -> Dict[str, Any]:
+def update_sharded_capacity(
+    area_id: str,
+    action: str,
+    count: int,
+    timestamp: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply an entry/exit delta to a randomly chosen counter shard
+    
+    The shard write can't be conditioned on the METADATA item, so the area
+    is checked first and no shard item is created for an unknown area.
+    
+    Args:
+        area_id: Area identifier
+        action: 'enter' to increment, 'exit' to decrement
+        count: Number of people
+        timestamp: Time of the update in epoch milliseconds
+    
+    Returns:
+        dict: Area data with the count summed across shards, or None if the
+        area doesn't exist
+    """
+    if not area_exists(area_id):
+        logger.warning(f"Area not found: {area_id}")
+        return None
+    
+    shard = random.randrange(COUNTER_SHARDS)
+    shard_key = {
+        'PK': {'S': f"AREA#{area_id}#{shard}"},
+        'SK': {'S': 'COUNTER'}
+    }
+    increment = count if action == 'enter' else -count
+    
+    client.update_item(
+        TableName=table_name,
+        Key=shard_key,
+        UpdateExpression=(
+            "SET area_id = :area_id, last_updated = :timestamp "
+            "ADD current_count :inc, update_count :one"
+        ),
+        ExpressionAttributeValues={
+            ':area_id': {'S': area_id},
+            ':inc': {'N': str(increment)},
+            ':one': {'N': '1'},
+            ':timestamp': {'N': str(timestamp)}
+        }
+    )
+    
+    items = get_sharded_items(area_id)
+    if not any(i['SK']['S'] == 'METADATA' for i in items):
+        _known_areas.discard(area_id)
+        return None
+    
+    total = sum(int(i['current_count']['N']) for i in items if 'current_count' in i)
+    
+    # Ensure count doesn't go below zero by compensating on this shard
+    if total < 0:
+        logger.warning(f"Negative count detected for {area_id}, resetting to 0")
+        client.update_item(
+            TableName=table_name,
+            Key=shard_key,
+            UpdateExpression="ADD current_count :fix",
+            ExpressionAttributeValues={':fix': {'N': str(-total)}}
+        )
+        total = 0
+    
+    logger.info(f"Successfully updated {area_id} (shard {shard}): new count = {total}")
+    return {'current_count': total, 'last_updated': timestamp}
+
+
+def area_exists(area_id: str) -> bool:
+    """
+    Check that an area's METADATA item exists
+    
+    Args:
+        area_id: Area identifier
+    
+    Returns:
+        bool: True if the area exists
+    """
+    if area_id in _known_areas:
+        return True
+    
+    response = client.get_item(
+        TableName=table_name,
+        Key={'PK': {'S': f"AREA#{area_id}"}, 'SK': {'S': 'METADATA'}},
+        ProjectionExpression='PK'
+    )
+    if 'Item' not in response:
+        return False
+    
+    _known_areas.add(area_id)
+    return True
+
+
+def get_sharded_items(area_id: str) -> List[Dict[str, Any]]:
+    """
+    Fetch the METADATA item and all counter shards for an area
+    
+    Args:
+        area_id: Area identifier
+    
+    Returns:
+        list: Raw (attribute-value) items that exist, in no particular order
+    """
+    pk = f"AREA#{area_id}"
+    keys = [{'PK': {'S': pk}, 'SK': {'S': 'METADATA'}}] + [
+        {'PK': {'S': f"{pk}#{shard}"}, 'SK': {'S': 'COUNTER'}}
+        for shard in range(COUNTER_SHARDS)
+    ]
+    request_items = {table_name: {'Keys': keys}}
+    
+    items = []
+    while request_items:
+        response = client.batch_get_item(RequestItems=request_items)
+        items.extend(response.get('Responses', {}).get(table_name, []))
+        request_items = response.get('UnprocessedKeys')
+    
+    return items
+
+
+def create_error_response(
+    status_code: int,
+    message: str,
+    timestamp: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Create a standardized error response
     
     Args:
         status_code: HTTP status code
         message: Error message
+        timestamp: ISO timestamp for the response (default: now)
     
     Returns:
         dict: Lambda response object
@@ -191,11 +700,11 @@ def create_error_response(status_code: int, message: str) -> Dict[str, Any]:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*'
         },
-        'body': json.dumps({
+        'body': orjson.dumps({
             'success': False,
             'error': message,
-            'timestamp': datetime.utcnow().isoformat()
-        })
+            'timestamp': timestamp or datetime.utcnow().isoformat()
+        }).decode()
     }
 
 
@@ -213,11 +722,25 @@ def get_current_capacity(area_id: str) -> Dict[str, Any]:
         pk = f"AREA#{area_id}"
         sk = "METADATA"
         
-        response = table.get_item(
-            Key={'PK': pk, 'SK': sk}
-        )
+        if COUNTER_SHARDS == 1:
+            response = client.get_item(
+                TableName=table_name,
+                Key={'PK': {'S': pk}, 'SK': {'S': sk}}
+            )
+            
+            item = response.get('Item', {})
+            return {k: deserializer.deserialize(v) for k, v in item.items()}
+        
+        # Sum the METADATA base count and all counter shards
+        items = get_sharded_items(area_id)
+        
+        item = next((i for i in items if i['SK']['S'] == sk), None)
+        if not item:
+            return {}
         
-        return response.get('Item', {})
+        total = sum(int(i['current_count']['N']) for i in items if 'current_count' in i)
+        item = {k: deserializer.deserialize(v) for k, v in item.items()}
+        return {**item, 'current_count': max(0, total)}
         
     except Exception as e:
         logger.error(f"Error fetching capacity: {str(e)}")
@@ -225,14 +748,41 @@ def get_current_capacity(area_id: str) -> Dict[str, Any]:
 
 
 # Lambda warmup handler
+def is_warmup_event(event: Dict[str, Any]) -> bool:
+    """
+    Check whether an event is a scheduled warmup ping
+    
+    Args:
+        event: Lambda event payload
+    
+    Returns:
+        bool: True for CloudWatch scheduled events or {"warmup": true} payloads
+    """
+    return (
+        event.get('source') == 'aws.events'
+        or bool(event.get('warmup'))
+        or bool(event.get('warmer'))
+    )
+
+
 def warmup_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Handle CloudWatch warmup events to keep Lambda warm
     
-    This prevents cold starts during peak hours.
+    This prevents cold starts during peak hours. Besides keeping the
+    execution environment alive, it issues a cheap DescribeTable call so
+    the connection pool holds a live TLS connection for the next request.
     """
     logger.info("Lambda warmup event received")
+    
+    # Skip priming if the invocation is close to timing out
+    if context is None or context.get_remaining_time_in_millis() > 5000:
+        try:
+            client.describe_table(TableName=table_name)
+        except Exception as e:
+            logger.warning(f"Warmup connection priming failed: {str(e)}")
+    
     return {
         'statusCode': 200,
-        'body': json.dumps({'status': 'warm'})
+        'body': orjson.dumps({'status': 'warm'}).decode()
     }
@@ -6,20 +6,70 @@ Handles all interactions with AWS DynamoDB including:
 - Updating capacity counts
 - Managing area metadata
 
-Uses boto3 for AWS SDK integration.
+Uses aioboto3 (asyncio wrapper around boto3) so database calls yield to
+the event loop instead of blocking it. A single low-level client is opened
+on startup and reused for the lifetime of the application.
 """
 
+import asyncio
 import os
-import boto3
-from boto3.dynamodb.conditions import Key
+import random
+import time
+import aioboto3
+from aiobotocore.config import AioConfig
+from contextlib import AsyncExitStack
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 
 from models import AreaCapacity, DynamoDBItem
 
 logger = logging.getLogger(__name__)
 
+# Areas tracked by the system (matches the seed data in init_database.py)
+DEFAULT_AREA_IDS = (
+    'weight-room',
+    'cardio',
+    'track',
+    'pool',
+    'basketball',
+    'racquetball',
+    'climbing',
+    'group-fitness',
+)
+
+# Shared converters between Python types and DynamoDB attribute values
+# (stateless, so one instance serves every request)
+_SERIALIZER = TypeSerializer()
+_DESERIALIZER = TypeDeserializer()
+
+
+def _timestamp_ms(value) -> int:
+    """
+    Convert a stored last_updated value to epoch milliseconds
+    
+    last_updated is stored as epoch milliseconds; items written before
+    that change hold an ISO string instead.
+    """
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp() * 1000)
+    return int(value)
+
+
+def _key(pk: str, sk: str) -> dict:
+    """Primary key in DynamoDB attribute value format"""
+    return {'PK': {'S': pk}, 'SK': {'S': sk}}
+
+
+def _format_timestamp(timestamp_ms: int) -> str:
+    """Format epoch milliseconds as an ISO timestamp (UTC) for API responses"""
+    return datetime.utcfromtimestamp(timestamp_ms / 1000).isoformat(timespec='milliseconds')
+
 
 class DynamoDBManager:
     """
@@ -36,6 +86,11 @@ class DynamoDBManager:
         Environment variables:
             AWS_REGION: AWS region (default: us-east-1)
             DYNAMODB_TABLE: Table name (default: urec-capacity)
+            UREC_AREA_IDS: Comma-separated area IDs (default: DEFAULT_AREA_IDS)
+            COUNTER_SHARDS: Counter shards per area (default: 1, unsharded)
+            AREA_METADATA_TTL: Seconds to cache static area fields (default: 300)
+            DAX_ENDPOINT: DAX cluster endpoint for area reads (optional)
+            UPDATE_DEBOUNCE_MS: Window for coalescing updates (default: 100, 0 disables)
             AWS_ACCESS_KEY_ID: AWS access key (optional if using IAM role)
             AWS_SECRET_ACCESS_KEY: AWS secret key (optional if using IAM role)
         """
@@ -43,7 +98,33 @@ class DynamoDBManager:
         self.region = os.getenv('AWS_REGION', 'us-east-1')
         self.table_name = os.getenv('DYNAMODB_TABLE', 'urec-capacity')
         
-        # Initialize boto3 client
+        # The set of areas is small, so reads go by primary key. Areas
+        # registered in the PK=ALL index are added to this list on first use.
+        area_ids = os.getenv('UREC_AREA_IDS')
+        if area_ids:
+            self.area_ids = [a.strip() for a in area_ids.split(',') if a.strip()]
+        else:
+            self.area_ids = list(DEFAULT_AREA_IDS)
+        self._area_index_loaded_at = None
+        
+        # With more than one shard, enter/exit deltas are spread across
+        # AREA#<area_id>#<n> counter items so a busy area's writes don't all
+        # hit one partition. The METADATA count is the base value and the
+        # shard counters are summed on read.
+        self.counter_shards = max(1, int(os.getenv('COUNTER_SHARDS', '1')))
+        
+        # Per-process cache of static area fields (name, max_capacity,
+        # is_open) so reads and updates only touch the counter attributes.
+        # Maps area_id -> (cached_at, metadata).
+        self.metadata_ttl = int(os.getenv('AREA_METADATA_TTL', '300'))
+        self._area_metadata = {}
+        
+        # Unknown area IDs are remembered briefly so repeated requests for
+        # them don't each batch-read every area. Maps area_id -> missed_at.
+        self.missing_area_ttl = 5
+        self._missing_areas = {}
+        
+        # Initialize aioboto3 session
         # In production, use IAM roles instead of access keys
         session_kwargs = {'region_name': self.region}
         
@@ -58,15 +139,477 @@ class DynamoDBManager:
         else:
             logger.info("Using default AWS credentials (IAM role or environment)")
         
-        # Create DynamoDB resource
+        self.session = aioboto3.Session(**session_kwargs)
+        
+        # Adaptive retries rate-limit the client when DynamoDB throttles
+        # (e.g. a busy area's partition) instead of retrying in a burst.
+        # Attempts and timeouts are kept short since a client is waiting on
+        # every call. Idle pooled connections are kept open for 30s between
+        # requests so they don't pay a new TLS handshake. (tcp_keepalive is
+        # not set: the pinned aiobotocore ignores socket options.)
+        self.boto_config = AioConfig(
+            max_pool_connections=50,
+            connect_timeout=5,
+            read_timeout=10,
+            retries={'max_attempts': 3, 'mode': 'adaptive'},
+            connector_args={'keepalive_timeout': 30}
+        )
+        
+        # Frontend polling makes get_area/get_all_areas read-heavy, so those
+        # reads can be served from a DAX cluster. Counter writes go through
+        # the cluster too, which updates its item cache (write-through).
+        self.dax_endpoint = os.getenv('DAX_ENDPOINT')
+        
+        # Enter/exit updates are summed per area and written once per
+        # window, so a burst of taps costs one UpdateItem per area. Reads
+        # include the deltas that haven't been written yet. A delta being
+        # written is moved to _inflight_deltas, and writes to an area hold
+        # its lock so a set_capacity reset never overlaps a flush. The
+        # buffer holds one small int per area (about 8), so its arithmetic
+        # stays plain dict updates; a Numba/NumPy kernel would cost more
+        # than it saves.
+        self.update_debounce = int(os.getenv('UPDATE_DEBOUNCE_MS', '100')) / 1000
+        self._pending_deltas = {}
+        self._inflight_deltas = {}
+        self._area_locks = {}
+        
+        # Last stored count per area, (count, seen_at), so a buffered update
+        # can answer without reading DynamoDB. Other workers and the Lambda
+        # write the same items, so a count is only trusted for
+        # known_count_ttl seconds (a few flush windows). _writes_started
+        # lets reads tell whether a write may have landed after they were sent.
+        self.known_count_ttl = 3 * self.update_debounce
+        self._known_counts = {}
+        self._writes_started = 0
+        
+        # Optional coroutine function called with the area_id after a
+        # buffered update has been written (e.g. to drop cached responses)
+        self.on_flush = None
+        
+        self._flush_stop = None
+        self._flush_task = None
+        
+        # Opened by connect() and held for the lifetime of the application
+        self._stack = None
+        self.client = None
+        self.dax = None
+    
+    async def connect(self):
+        """
+        Open the DynamoDB client
+        
+        The client (and its HTTP connection pool) is entered once and kept
+        open until close(), rather than per call. Call on application startup.
+        """
+        if self.client is not None:
+            return
+        
         try:
-            self.dynamodb = boto3.resource('dynamodb', **session_kwargs)
-            self.table = self.dynamodb.Table(self.table_name)
-            logger.info(f"Connected to DynamoDB table: {self.table_name}")
+            self._stack = AsyncExitStack()
+            self.client = await self._stack.enter_async_context(
+                self.session.client('dynamodb', config=self.boto_config)
+            )
+            logger.info("Connected to DynamoDB table: %s", self.table_name)
         except Exception as e:
-            logger.error(f"Failed to connect to DynamoDB: {e}")
+            logger.error("Failed to connect to DynamoDB: %s", e)
             # Set to None so we can handle gracefully
-            self.table = None
+            await self.close()
+            return
+        
+        if self.dax_endpoint:
+            try:
+                # Optional dependency, only needed when DAX is configured
+                from amazondax import AmazonDaxClient
+                
+                # The DAX client is synchronous and discovers the cluster's
+                # nodes on creation, so keep it off the event loop
+                self.dax = await asyncio.to_thread(
+                    AmazonDaxClient,
+                    endpoint_url=self.dax_endpoint,
+                    region_name=self.region
+                )
+                logger.info("Reading areas through DAX: %s", self.dax_endpoint)
+            except Exception as e:
+                # Reads fall back to DynamoDB
+                logger.error("Failed to connect to DAX: %s", e)
+                self.dax = None
+        
+        if self.update_debounce > 0:
+            self._flush_stop = asyncio.Event()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+    
+    async def close(self):
+        """Close the DynamoDB client. Call on application shutdown."""
+        if self._flush_task is not None:
+            # The flusher writes out anything still buffered, then exits
+            self._flush_stop.set()
+            await self._flush_task
+            self._flush_task = None
+        
+        if self._stack is not None:
+            await self._stack.aclose()
+        if self.dax is not None:
+            await asyncio.to_thread(self.dax.close)
+        
+        self._stack = None
+        self.client = None
+        self.dax = None
+    
+    async def _flush_loop(self):
+        """Write buffered updates every UPDATE_DEBOUNCE_MS until close()"""
+        stopping = False
+        while not stopping:
+            try:
+                await asyncio.wait_for(self._flush_stop.wait(), self.update_debounce)
+                stopping = True
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self.flush_updates()
+            except Exception as e:
+                logger.error("Error flushing capacity updates: %s", e)
+    
+    async def flush_updates(self):
+        """
+        Write buffered updates with one UpdateItem per area
+        
+        A failed write puts its delta back in the buffer, so it is retried
+        on the next flush.
+        """
+        await asyncio.gather(
+            *(self._flush_area(area_id) for area_id in list(self._pending_deltas)),
+            return_exceptions=True
+        )
+    
+    async def _flush_area(self, area_id: str):
+        """Write the buffered delta of one area"""
+        async with self._area_lock(area_id):
+            delta = self._pending_deltas.pop(area_id, 0)
+            if not delta:
+                return
+            
+            # Reads leave the delta out while it is in flight, since they
+            # can't tell whether the stored count includes it yet
+            self._inflight_deltas[area_id] = delta
+            self._writes_started += 1
+            try:
+                await self._write_capacity(area_id, 'enter' if delta > 0 else 'exit', abs(delta))
+            except Exception:
+                self._pending_deltas[area_id] = self._pending_deltas.get(area_id, 0) + delta
+                raise
+            finally:
+                del self._inflight_deltas[area_id]
+        
+        if self.on_flush is not None:
+            await self.on_flush(area_id)
+    
+    def _area_lock(self, area_id: str) -> asyncio.Lock:
+        """Lock serializing buffered writes and resets of an area"""
+        lock = self._area_locks.get(area_id)
+        if lock is None:
+            lock = self._area_locks[area_id] = asyncio.Lock()
+        return lock
+    
+    def _shard_keys(self, area_id: str) -> List[dict]:
+        """Primary keys of the counter shard items for an area"""
+        return [
+            _key(f"AREA#{area_id}#{shard}", 'COUNTER')
+            for shard in range(self.counter_shards)
+        ]
+    
+    def _deserialize(self, item: dict) -> dict:
+        """Convert an item from DynamoDB attribute values to Python types"""
+        return {k: _DESERIALIZER.deserialize(v) for k, v in item.items()}
+    
+    def _serialize(self, item: dict) -> dict:
+        """Convert an item from Python types to DynamoDB attribute values"""
+        return {k: _SERIALIZER.serialize(v) for k, v in item.items()}
+    
+    async def _get_item(self, key: dict, cached: bool = False, **kwargs) -> Optional[dict]:
+        """
+        GetItem, through DAX when cached and a DAX cluster is configured
+        
+        The DAX client is synchronous, so its calls run in a worker thread.
+        
+        Returns:
+            dict: The item, or None if not found
+        """
+        if cached and self.dax is not None:
+            response = await asyncio.to_thread(
+                self.dax.get_item, TableName=self.table_name, Key=key, **kwargs
+            )
+        else:
+            response = await self.client.get_item(
+                TableName=self.table_name, Key=key, **kwargs
+            )
+        
+        item = response.get('Item')
+        return self._deserialize(item) if item is not None else None
+    
+    async def _update_item(self, **kwargs) -> dict:
+        """
+        UpdateItem, through DAX when a DAX cluster is configured
+        
+        Writes go through the cluster (write-through) so its item cache
+        holds the new count, rather than serving the old one to cached
+        reads until the cache entry expires.
+        """
+        if self.dax is not None:
+            return await asyncio.to_thread(
+                self.dax.update_item, TableName=self.table_name, **kwargs
+            )
+        return await self.client.update_item(TableName=self.table_name, **kwargs)
+    
+    async def _batch_get(
+        self, keys: List[dict], cached: bool = False, **options
+    ) -> List[dict]:
+        """
+        Fetch items by primary key with BatchGetItem
+        
+        Args:
+            keys: Primary keys to fetch
+            cached: Read through DAX if configured (may lag recent writes)
+            **options: Extra per-table request fields (e.g. ProjectionExpression)
+        
+        Returns:
+            List[dict]: Items that exist, in no particular order
+        """
+        items = []
+        # BatchGetItem takes at most 100 keys
+        for start in range(0, len(keys), 100):
+            request_items = {
+                self.table_name: {'Keys': keys[start:start + 100], **options}
+            }
+            while request_items:
+                if cached and self.dax is not None:
+                    response = await asyncio.to_thread(
+                        self.dax.batch_get_item, RequestItems=request_items
+                    )
+                else:
+                    response = await self.client.batch_get_item(RequestItems=request_items)
+                items.extend(
+                    self._deserialize(item)
+                    for item in response.get('Responses', {}).get(self.table_name, [])
+                )
+                # Retry any keys DynamoDB could not process (throttling)
+                request_items = response.get('UnprocessedKeys')
+        
+        return items
+    
+    async def _batch_write(self, items: List[dict]):
+        """
+        Put items with BatchWriteItem
+        
+        Args:
+            items: Items (Python types) to put
+        """
+        requests = [{'PutRequest': {'Item': self._serialize(item)}} for item in items]
+        
+        # BatchWriteItem takes at most 25 requests
+        for start in range(0, len(requests), 25):
+            request_items = {self.table_name: requests[start:start + 25]}
+            while request_items:
+                if self.dax is not None:
+                    response = await asyncio.to_thread(
+                        self.dax.batch_write_item, RequestItems=request_items
+                    )
+                else:
+                    response = await self.client.batch_write_item(RequestItems=request_items)
+                # Retry any items DynamoDB could not process (throttling)
+                request_items = response.get('UnprocessedItems')
+    
+    async def _load_area_ids(self):
+        """
+        Add areas registered in the area index to self.area_ids
+        
+        The index is a set of pointer items (PK=ALL, SK=AREA#<area_id>)
+        written by create_area and the seed script, so discovering areas is
+        a single Query instead of a table scan. It is re-read after
+        AREA_METADATA_TTL seconds.
+        """
+        if (
+            self._area_index_loaded_at is not None
+            and time.monotonic() - self._area_index_loaded_at <= self.metadata_ttl
+        ):
+            return
+        
+        query_kwargs = {
+            'TableName': self.table_name,
+            'KeyConditionExpression': "PK = :pk",
+            'ExpressionAttributeValues': {':pk': {'S': 'ALL'}},
+            'ProjectionExpression': 'SK'
+        }
+        
+        while True:
+            response = await self.client.query(**query_kwargs)
+            for item in response.get('Items', []):
+                area_id = item['SK']['S'].split('#', 1)[1]
+                if area_id not in self.area_ids:
+                    self.area_ids.append(area_id)
+            
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        
+        self._area_index_loaded_at = time.monotonic()
+    
+    async def _get_metadata(self, area_id: str) -> Optional[dict]:
+        """
+        Get static area fields, reading them from DynamoDB on a cache miss
+        
+        A miss refreshes the metadata of every known area with one
+        BatchGetItem call, so a cold process pays a single round trip.
+        
+        Args:
+            area_id: Unique identifier for the area
+        
+        Returns:
+            dict: METADATA fields without the counter, or None if not found
+        """
+        metadata = self._cached_metadata(area_id)
+        if metadata is not None:
+            return metadata
+        
+        missed_at = self._missing_areas.get(area_id)
+        if missed_at is not None:
+            if time.monotonic() - missed_at <= self.missing_area_ttl:
+                return None
+            del self._missing_areas[area_id]
+        
+        area_ids = list(self.area_ids)
+        if area_id not in area_ids:
+            area_ids.append(area_id)
+        
+        items = await self._batch_get(
+            [_key(f"AREA#{a}", 'METADATA') for a in area_ids],
+            ProjectionExpression="area_id, #name, max_capacity, is_open",
+            ExpressionAttributeNames={'#name': 'name'}
+        )
+        for item in items:
+            self._cache_metadata(item)
+        
+        metadata = self._cached_metadata(area_id)
+        if metadata is None:
+            if len(self._missing_areas) >= 1024:
+                self._missing_areas.clear()
+            self._missing_areas[area_id] = time.monotonic()
+        return metadata
+    
+    def _cached_metadata(self, area_id: str) -> Optional[dict]:
+        """Get static area fields from the cache if present and not expired"""
+        entry = self._area_metadata.get(area_id)
+        if entry is None:
+            return None
+        
+        cached_at, metadata = entry
+        if time.monotonic() - cached_at > self.metadata_ttl:
+            del self._area_metadata[area_id]
+            return None
+        
+        return metadata
+    
+    def _cache_metadata(self, item: dict) -> dict:
+        """Store the static fields of a METADATA item in the cache"""
+        metadata = {
+            'area_id': item['area_id'],
+            'name': item['name'],
+            'max_capacity': item['max_capacity'],
+            'is_open': item.get('is_open', True)
+        }
+        self._area_metadata[item['area_id']] = (time.monotonic(), metadata)
+        return metadata
+    
+    def invalidate_metadata(self, area_id: Optional[str] = None):
+        """
+        Drop cached static area fields
+        
+        Call after changing an area's name, max_capacity or is_open.
+        
+        Args:
+            area_id: Area to invalidate (default: all areas)
+        """
+        if area_id is None:
+            self._area_metadata.clear()
+            self._missing_areas.clear()
+        else:
+            self._area_metadata.pop(area_id, None)
+            self._missing_areas.pop(area_id, None)
+    
+    def _to_area(
+        self,
+        item: dict,
+        shard_items=(),
+        timestamp: Optional[int] = None,
+        read_started: Optional[int] = None,
+        cache_metadata: bool = True
+    ) -> AreaCapacity:
+        """
+        Convert a METADATA item (plus any counter shards) to an AreaCapacity
+        
+        The stored count is remembered for buffered updates. Items returned
+        by a write are always current; for a read, pass read_started (the
+        _writes_started value when it was sent) and the count is only kept
+        if no write started since.
+        
+        Args:
+            item: METADATA item for the area
+            shard_items: Counter shard items for the area
+            timestamp: Fallback (epoch ms) for items without last_updated
+                (default: now)
+            read_started: _writes_started when the read was sent
+            cache_metadata: Whether the item's static fields were just read
+                from DynamoDB and should refresh the metadata cache. Pass
+                False for items merged with already-cached metadata.
+        
+        Returns:
+            AreaCapacity: Area capacity data with the summed, non-negative count
+        """
+        if cache_metadata and 'name' in item:
+            self._cache_metadata(item)
+        
+        area_id = item['area_id']
+        current_count = int(item.get('current_count', 0))
+        last_updated = item.get('last_updated')
+        if last_updated is not None:
+            last_updated = _timestamp_ms(last_updated)
+        
+        for shard in shard_items:
+            current_count += int(shard.get('current_count', 0))
+            if shard.get('last_updated') is not None:
+                shard_updated = _timestamp_ms(shard['last_updated'])
+                if last_updated is None or shard_updated > last_updated:
+                    last_updated = shard_updated
+        
+        if last_updated is None:
+            last_updated = timestamp or int(time.time() * 1000)
+        
+        # Shards can dip below zero individually; clamp the total
+        current_count = max(0, current_count)
+        if read_started is None or (
+            read_started == self._writes_started
+            and area_id not in self._inflight_deltas
+        ):
+            self._known_counts[area_id] = (current_count, time.monotonic())
+        
+        # Include updates that are buffered but not yet written
+        return self._area_with_pending(item, current_count, last_updated)
+    
+    def _area_with_pending(
+        self,
+        metadata: dict,
+        stored_count: int,
+        last_updated: int
+    ) -> AreaCapacity:
+        """AreaCapacity for a stored count plus the area's buffered delta"""
+        return AreaCapacity(
+            area_id=metadata['area_id'],
+            name=metadata['name'],
+            current_count=max(0, stored_count + self._pending_deltas.get(metadata['area_id'], 0)),
+            max_capacity=int(metadata['max_capacity']),
+            is_open=bool(metadata.get('is_open', True)),
+            last_updated=_format_timestamp(last_updated)
+        )
     
     async def verify_connection(self) -> bool:
         """
@@ -76,14 +619,14 @@ class DynamoDBManager:
             bool: True if connection is healthy, False otherwise
         """
         try:
-            if not self.table:
+            if not self.client:
                 return False
             
             # Try to describe the table (minimal operation)
-            _ = self.table.table_status
+            await self.client.describe_table(TableName=self.table_name)
             return True
         except Exception as e:
-            logger.error(f"DynamoDB connection verification failed: {e}")
+            logger.error("DynamoDB connection verification failed: %s", e)
             return False
     
     async def get_all_areas(self) -> List[AreaCapacity]:
@@ -97,40 +640,55 @@ class DynamoDBManager:
             Exception: If DynamoDB query fails
         """
         try:
-            if not self.table:
+            if not self.client:
                 logger.warning("DynamoDB table not initialized")
                 return []
             
-            # Scan the table for all area items
-            # In production, you might want to use a GSI for better performance
-            response = self.table.scan(
-                FilterExpression=Key('SK').eq('METADATA')
-            )
+            await self._load_area_ids()
             
-            items = response.get('Items', [])
+            # Fetch all area items (and counter shards) by primary key
+            keys = []
+            for area_id in self.area_ids:
+                keys.append(_key(f"AREA#{area_id}", 'METADATA'))
+                if self.counter_shards > 1:
+                    keys.extend(self._shard_keys(area_id))
             
-            # Convert DynamoDB items to AreaCapacity models
-            areas = []
+            read_started = self._writes_started
+            items = await self._batch_get(keys, cached=True)
+            timestamp = int(time.time() * 1000)
+            
+            metadata = {}
+            shards = {}
             for item in items:
+                if item['SK'] == 'METADATA':
+                    metadata[item['area_id']] = item
+                else:
+                    shards.setdefault(item['area_id'], []).append(item)
+            
+            # Convert DynamoDB items to AreaCapacity models, filling a
+            # pre-sized list and trimming any areas that were skipped
+            to_area = self._to_area
+            areas = [None] * len(metadata)
+            count = 0
+            for area_id in self.area_ids:
+                item = metadata.get(area_id)
+                if not item:
+                    continue
                 try:
-                    area = AreaCapacity(
-                        area_id=item['area_id'],
-                        name=item['name'],
-                        current_count=int(item['current_count']),
-                        max_capacity=int(item['max_capacity']),
-                        is_open=bool(item.get('is_open', True)),
-                        last_updated=item.get('last_updated', datetime.utcnow().isoformat())
+                    areas[count] = to_area(
+                        item, shards.get(area_id, ()), timestamp, read_started
                     )
-                    areas.append(area)
+                    count += 1
                 except Exception as e:
-                    logger.error(f"Error parsing DynamoDB item: {e}")
+                    logger.error("Error parsing DynamoDB item: %s", e)
                     continue
+            del areas[count:]
             
-            logger.info(f"Retrieved {len(areas)} areas from DynamoDB")
+            logger.info("Retrieved %s areas from DynamoDB", len(areas))
             return areas
             
         except Exception as e:
-            logger.error(f"Error fetching areas from DynamoDB: {e}")
+            logger.error("Error fetching areas from DynamoDB: %s", e)
             raise
     
     async def get_area(self, area_id: str) -> Optional[AreaCapacity]:
@@ -147,7 +705,7 @@ class DynamoDBManager:
             Exception: If DynamoDB query fails
         """
         try:
-            if not self.table:
+            if not self.client:
                 logger.warning("DynamoDB table not initialized")
                 return None
             
@@ -155,45 +713,72 @@ class DynamoDBManager:
             pk = f"AREA#{area_id}"
             sk = "METADATA"
             
-            # Get item from DynamoDB
-            response = self.table.get_item(
-                Key={'PK': pk, 'SK': sk}
-            )
-            
-            item = response.get('Item')
+            read_started = self._writes_started
+            metadata = None
+            if self.counter_shards > 1:
+                # Fetch the METADATA item and counter shards together
+                items = await self._batch_get(
+                    [_key(pk, sk)] + self._shard_keys(area_id),
+                    cached=True
+                )
+                item = next((i for i in items if i['SK'] == sk), None)
+                shard_items = [i for i in items if i['SK'] != sk]
+            else:
+                # With cached metadata only the counter attributes are read
+                metadata = self._cached_metadata(area_id)
+                
+                if metadata:
+                    item = await self._get_item(
+                        _key(pk, sk),
+                        cached=True,
+                        ProjectionExpression="current_count, last_updated"
+                    )
+                    if item is not None:
+                        item = {**metadata, **item}
+                    else:
+                        self.invalidate_metadata(area_id)
+                else:
+                    # Get item from DynamoDB
+                    item = await self._get_item(_key(pk, sk), cached=True)
+                shard_items = ()
             
             if not item:
-                logger.warning(f"Area not found: {area_id}")
+                logger.warning("Area not found: %s", area_id)
                 return None
             
             # Convert to AreaCapacity model
-            area = AreaCapacity(
-                area_id=item['area_id'],
-                name=item['name'],
-                current_count=int(item['current_count']),
-                max_capacity=int(item['max_capacity']),
-                is_open=bool(item.get('is_open', True)),
-                last_updated=item.get('last_updated', datetime.utcnow().isoformat())
+            area = self._to_area(
+                item,
+                shard_items,
+                read_started=read_started,
+                cache_metadata=metadata is None
             )
             
-            logger.info(f"Retrieved area: {area_id}")
+            logger.info("Retrieved area: %s", area_id)
             return area
             
         except Exception as e:
-            logger.error(f"Error fetching area {area_id} from DynamoDB: {e}")
+            logger.error("Error fetching area %s from DynamoDB: %s", area_id, e)
             raise
     
     async def update_capacity(
         self,
         area_id: str,
-        action: str
+        action: str,
+        count: int = 1
     ) -> Optional[AreaCapacity]:
         """
         Update capacity count for an area (increment or decrement)
         
+        While the flusher is running (UPDATE_DEBOUNCE_MS > 0) the change is
+        buffered and written by the next flush. The returned count is the
+        last stored count plus the unwritten deltas; DynamoDB is only read
+        when that count is older than known_count_ttl.
+        
         Args:
             area_id: Area to update
             action: 'enter' to increment, 'exit' to decrement
+            count: Number of people (default: 1)
         
         Returns:
             AreaCapacity: Updated area data, or None if area not found
@@ -201,8 +786,64 @@ class DynamoDBManager:
         Raises:
             Exception: If DynamoDB update fails
         """
+        if self._flush_task is None:
+            return await self._write_capacity(area_id, action, count)
+        
         try:
-            if not self.table:
+            metadata = await self._get_metadata(area_id)
+            if not metadata:
+                logger.warning("Area not found: %s", area_id)
+                return None
+            
+            delta = count if action == 'enter' else -count
+            timestamp = int(time.time() * 1000)
+            
+            known = self._known_counts.get(area_id)
+            if known is None or time.monotonic() - known[1] > self.known_count_ttl:
+                # Read the stored count before buffering, so a failed read
+                # doesn't leave behind a delta the client will retry
+                area = await self.get_area(area_id)
+                if area is None:
+                    return None
+                self._pending_deltas[area_id] = self._pending_deltas.get(area_id, 0) + delta
+                return area.model_copy(update={
+                    'current_count': max(0, area.current_count + delta),
+                    'last_updated': _format_timestamp(timestamp)
+                })
+            
+            self._pending_deltas[area_id] = self._pending_deltas.get(area_id, 0) + delta
+            return self._area_with_pending(
+                metadata,
+                known[0] + self._inflight_deltas.get(area_id, 0),
+                timestamp
+            )
+            
+        except Exception as e:
+            logger.error("Error updating capacity for %s: %s", area_id, e)
+            raise
+    
+    async def _write_capacity(
+        self,
+        area_id: str,
+        action: str,
+        count: int
+    ) -> Optional[AreaCapacity]:
+        """
+        Write a capacity change to DynamoDB with a single atomic update
+        
+        Args:
+            area_id: Area to update
+            action: 'enter' to increment, 'exit' to decrement
+            count: Number of people
+        
+        Returns:
+            AreaCapacity: Updated area data, or None if area not found
+            
+        Raises:
+            Exception: If DynamoDB update fails
+        """
+        try:
+            if not self.client:
                 logger.warning("DynamoDB table not initialized")
                 return None
             
@@ -210,51 +851,108 @@ class DynamoDBManager:
             pk = f"AREA#{area_id}"
             sk = "METADATA"
             
-            # Determine the update value
-            increment = 1 if action == 'enter' else -1
-            
-            # Update item in DynamoDB with atomic counter
-            response = self.table.update_item(
-                Key={'PK': pk, 'SK': sk},
-                UpdateExpression=(
-                    "SET current_count = if_not_exists(current_count, :zero) + :inc, "
-                    "last_updated = :timestamp"
-                ),
-                ExpressionAttributeValues={
-                    ':inc': increment,
-                    ':zero': 0,
-                    ':timestamp': datetime.utcnow().isoformat()
-                },
-                ReturnValues='ALL_NEW'
-            )
+            timestamp = int(time.time() * 1000)
             
-            item = response.get('Attributes')
+            if self.counter_shards > 1:
+                # The shard write can't be conditioned on the METADATA item,
+                # so check the area first rather than leave a stray shard
+                if not await self._get_metadata(area_id):
+                    logger.warning("Area not found: %s", area_id)
+                    return None
+                
+                # Spread the write over a random counter shard
+                shard = random.randrange(self.counter_shards)
+                shard_key = _key(f"{pk}#{shard}", 'COUNTER')
+                await self._update_item(
+                    Key=shard_key,
+                    UpdateExpression=(
+                        "SET area_id = :area_id, last_updated = :timestamp "
+                        "ADD current_count :inc"
+                    ),
+                    ExpressionAttributeValues={
+                        ':area_id': {'S': area_id},
+                        ':inc': {'N': str(count if action == 'enter' else -count)},
+                        ':timestamp': {'N': str(timestamp)}
+                    }
+                )
+                
+                items = await self._batch_get([_key(pk, sk)] + self._shard_keys(area_id))
+                item = next((i for i in items if i['SK'] == sk), None)
+                
+                if not item:
+                    logger.warning("Area not found after update: %s", area_id)
+                    return None
+                
+                # Ensure count doesn't go below zero by compensating on this shard
+                total = sum(int(i.get('current_count', 0)) for i in items)
+                if total < 0:
+                    await self._update_item(
+                        Key=shard_key,
+                        UpdateExpression="ADD current_count :fix",
+                        ExpressionAttributeValues={':fix': {'N': str(-total)}}
+                    )
+                
+                area = self._to_area(item, [i for i in items if i['SK'] != sk], timestamp)
+                logger.info("Updated capacity for %s: %s -> %s", area_id, action, area.current_count)
+                return area
             
-            if not item:
-                logger.warning(f"Area not found after update: {area_id}")
-                return None
+            delta = count if action == 'enter' else -count
+            
+            # One atomic ADD; the condition rejects unknown areas (instead of
+            # creating a stub item) and exits that would go below zero
+            condition = "attribute_exists(PK)"
+            values = {
+                ':delta': {'N': str(delta)},
+                ':timestamp': {'N': str(timestamp)}
+            }
+            if delta < 0:
+                condition += " AND current_count >= :cnt"
+                values[':cnt'] = {'N': str(count)}
+            
+            try:
+                response = await self._update_item(
+                    Key=_key(pk, sk),
+                    UpdateExpression="ADD current_count :delta SET last_updated = :timestamp",
+                    ConditionExpression=condition,
+                    ExpressionAttributeValues=values,
+                    ReturnValues='ALL_NEW',
+                    ReturnValuesOnConditionCheckFailure='ALL_OLD'
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                # DAX doesn't return the old item, so check the area instead
+                exists = 'Item' in e.response or (
+                    self.dax is not None
+                    and delta < 0
+                    and await self._get_metadata(area_id) is not None
+                )
+                if not exists:
+                    logger.warning("Area not found: %s", area_id)
+                    return None
+                
+                # Count would go below zero, clamp it instead
+                response = await self._update_item(
+                    Key=_key(pk, sk),
+                    UpdateExpression="SET current_count = :zero, last_updated = :timestamp",
+                    ConditionExpression="attribute_exists(PK)",
+                    ExpressionAttributeValues={
+                        ':zero': {'N': '0'},
+                        ':timestamp': {'N': str(timestamp)}
+                    },
+                    ReturnValues='ALL_NEW'
+                )
             
-            # Ensure count doesn't go below zero
-            if item['current_count'] < 0:
-                # Reset to zero if negative
-                await self.set_capacity(area_id, 0)
-                item['current_count'] = 0
+            item = self._deserialize(response['Attributes'])
             
             # Convert to AreaCapacity model
-            area = AreaCapacity(
-                area_id=item['area_id'],
-                name=item['name'],
-                current_count=int(item['current_count']),
-                max_capacity=int(item['max_capacity']),
-                is_open=bool(item.get('is_open', True)),
-                last_updated=item.get('last_updated', datetime.utcnow().isoformat())
-            )
+            area = self._to_area(item, timestamp=timestamp)
             
-            logger.info(f"Updated capacity for {area_id}: {action} -> {area.current_count}")
+            logger.info("Updated capacity for %s: %s -> %s", area_id, action, area.current_count)
             return area
             
         except Exception as e:
-            logger.error(f"Error updating capacity for {area_id}: {e}")
+            logger.error("Error updating capacity for %s: %s", area_id, e)
             raise
     
     async def set_capacity(self, area_id: str, count: int) -> Optional[AreaCapacity]:
@@ -272,7 +970,7 @@ class DynamoDBManager:
             Exception: If DynamoDB update fails
         """
         try:
-            if not self.table:
+            if not self.client:
                 logger.warning("DynamoDB table not initialized")
                 return None
             
@@ -280,38 +978,55 @@ class DynamoDBManager:
             pk = f"AREA#{area_id}"
             sk = "METADATA"
             
-            # Update item in DynamoDB
-            response = self.table.update_item(
-                Key={'PK': pk, 'SK': sk},
-                UpdateExpression="SET current_count = :count, last_updated = :timestamp",
-                ExpressionAttributeValues={
-                    ':count': max(0, count),  # Ensure non-negative
-                    ':timestamp': datetime.utcnow().isoformat()
-                },
-                ReturnValues='ALL_NEW'
-            )
-            
-            item = response.get('Attributes')
+            timestamp = int(time.time() * 1000)
             
-            if not item:
-                logger.warning(f"Area not found: {area_id}")
+            metadata = await self._get_metadata(area_id)
+            if not metadata:
+                logger.warning("Area not found: %s", area_id)
                 return None
             
-            # Convert to AreaCapacity model
-            area = AreaCapacity(
-                area_id=item['area_id'],
-                name=item['name'],
-                current_count=int(item['current_count']),
-                max_capacity=int(item['max_capacity']),
-                is_open=bool(item.get('is_open', True)),
-                last_updated=item.get('last_updated', datetime.utcnow().isoformat())
-            )
+            # The new count replaces the updates buffered so far. Waiting
+            # for the area's lock lets an in-flight flush land first; updates
+            # made meanwhile stay buffered and apply on top of the new count.
+            self._pending_deltas.pop(area_id, None)
             
-            logger.info(f"Set capacity for {area_id} to {count}")
+            async with self._area_lock(area_id):
+                self._writes_started += 1
+                
+                if self.counter_shards > 1:
+                    # Zero the counter shards so the METADATA count is the total
+                    await self._batch_write([
+                        {
+                            'PK': f"{pk}#{shard}",
+                            'SK': 'COUNTER',
+                            'area_id': area_id,
+                            'current_count': 0,
+                            'last_updated': timestamp
+                        }
+                        for shard in range(self.counter_shards)
+                    ])
+                
+                # Update item in DynamoDB
+                response = await self._update_item(
+                    Key=_key(pk, sk),
+                    UpdateExpression="SET current_count = :count, last_updated = :timestamp",
+                    ExpressionAttributeValues={
+                        ':count': {'N': str(max(0, count))},  # Ensure non-negative
+                        ':timestamp': {'N': str(timestamp)}
+                    },
+                    ReturnValues='UPDATED_NEW'
+                )
+                
+                item = {**metadata, **self._deserialize(response.get('Attributes', {}))}
+                
+                # Convert to AreaCapacity model
+                area = self._to_area(item, timestamp=timestamp, cache_metadata=False)
+                
+            logger.info("Set capacity for %s to %s", area_id, count)
             return area
             
         except Exception as e:
-            logger.error(f"Error setting capacity for {area_id}: {e}")
+            logger.error("Error setting capacity for %s: %s", area_id, e)
             raise
     
     async def create_area(
@@ -337,14 +1052,16 @@ class DynamoDBManager:
             Exception: If DynamoDB put fails
         """
         try:
-            if not self.table:
+            if not self.client:
                 raise Exception("DynamoDB table not initialized")
             
             # Construct primary key
             pk = f"AREA#{area_id}"
             sk = "METADATA"
             
-            timestamp = datetime.utcnow().isoformat()
+            now = time.time()
+            timestamp = int(now * 1000)
+            created_at = datetime.utcfromtimestamp(now).isoformat()
             
             # Create item
             item = {
@@ -356,11 +1073,22 @@ class DynamoDBManager:
                 'max_capacity': max_capacity,
                 'is_open': is_open,
                 'last_updated': timestamp,
-                'created_at': timestamp
+                'created_at': created_at
             }
             
-            # Put item in DynamoDB
-            self.table.put_item(Item=item)
+            # Put item (and its area index entry) in DynamoDB
+            await self._batch_write([
+                item,
+                {
+                    'PK': 'ALL',
+                    'SK': pk,
+                    'area_id': area_id
+                }
+            ])
+            
+            self.invalidate_metadata(area_id)
+            if area_id not in self.area_ids:
+                self.area_ids.append(area_id)
             
             area = AreaCapacity(
                 area_id=area_id,
@@ -368,12 +1096,12 @@ class DynamoDBManager:
                 current_count=0,
                 max_capacity=max_capacity,
                 is_open=is_open,
-                last_updated=timestamp
+                last_updated=_format_timestamp(timestamp)
             )
             
-            logger.info(f"Created area: {area_id}")
+            logger.info("Created area: %s", area_id)
             return area
             
         except Exception as e:
-            logger.error(f"Error creating area {area_id}: {e}")
+            logger.error("Error creating area %s: %s", area_id, e)
             raise
@@ -20,6 +20,8 @@ Environment Variables:
 import boto3
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from botocore.exceptions import ClientError
 
@@ -142,82 +144,126 @@ def create_dynamodb_table(dynamodb):
             raise
 
 
-def seed_areas(table):
+def seed_areas(dynamodb, table):
     """
     Seed initial area data into DynamoDB
     
+    Existing areas are looked up with a single BatchGetItem call and new
+    areas are written through a batch writer, so seeding takes a handful
+    of round trips instead of two per area.
+    
     Args:
+        dynamodb: boto3 DynamoDB resource
         table: DynamoDB table object
     """
     print("\nSeeding initial area data...")
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    now = time.time()
+    timestamp = datetime.utcfromtimestamp(now).isoformat() + "Z"
+    # last_updated is stored as epoch milliseconds
+    timestamp_ms = int(now * 1000)
     
     created_count = 0
     updated_count = 0
     
-    for area_config in INITIAL_AREAS:
-        area_id = area_config['area_id']
-        pk = f"AREA#{area_id}"
-        sk = "METADATA"
-        
-        # Check if area already exists
-        try:
-            response = table.get_item(Key={'PK': pk, 'SK': sk})
+    # Classify existing vs new areas in one request
+    keys = [
+        {'PK': f"AREA#{area_config['area_id']}", 'SK': 'METADATA'}
+        for area_config in INITIAL_AREAS
+    ]
+    existing_pks = set()
+    request_items = {TABLE_NAME: {'Keys': keys, 'ProjectionExpression': 'PK'}}
+    
+    while request_items:
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+        for item in response.get('Responses', {}).get(TABLE_NAME, []):
+            existing_pks.add(item['PK'])
+        request_items = response.get('UnprocessedKeys')
+    
+    existing_areas = []
+    
+    # Create new areas
+    with table.batch_writer() as batch:
+        for area_config in INITIAL_AREAS:
+            area_id = area_config['area_id']
+            pk = f"AREA#{area_id}"
             
-            if 'Item' in response:
-                print(f"  - {area_config['name']}: Already exists (keeping current count)")
-                
-                # Update max_capacity if it changed
-                table.update_item(
-                    Key={'PK': pk, 'SK': sk},
-                    UpdateExpression="SET max_capacity = :max_cap, #name = :name",
-                    ExpressionAttributeNames={'#name': 'name'},
-                    ExpressionAttributeValues={
-                        ':max_cap': area_config['max_capacity'],
-                        ':name': area_config['name']
-                    }
-                )
-                updated_count += 1
+            # Register the area in the area index (PK=ALL) used to list areas
+            batch.put_item(Item={'PK': 'ALL', 'SK': pk, 'area_id': area_id})
+            
+            if pk in existing_pks:
+                existing_areas.append(area_config)
                 continue
-                
-        except ClientError:
-            pass
-        
-        # Create new area
-        item = {
-            'PK': pk,
-            'SK': sk,
-            'area_id': area_id,
-            'name': area_config['name'],
-            'current_count': 0,
-            'max_capacity': area_config['max_capacity'],
-            'is_open': True,
-            'last_updated': timestamp,
-            'created_at': timestamp
-        }
-        
-        table.put_item(Item=item)
-        print(f"  ✓ {area_config['name']}: Created (capacity: {area_config['max_capacity']})")
-        created_count += 1
+            
+            batch.put_item(Item={
+                'PK': pk,
+                'SK': 'METADATA',
+                'area_id': area_id,
+                'name': area_config['name'],
+                'current_count': 0,
+                'max_capacity': area_config['max_capacity'],
+                'is_open': True,
+                'last_updated': timestamp_ms,
+                'created_at': timestamp
+            })
+            print(f"  ✓ {area_config['name']}: Created (capacity: {area_config['max_capacity']})")
+            created_count += 1
+    
+    # Update max_capacity/name on existing areas (keeping current count).
+    # UpdateItem can't be batched, so the calls run concurrently; boto3
+    # clients (unlike resources) are thread-safe.
+    client = table.meta.client
+    
+    def update_area(area_config):
+        client.update_item(
+            TableName=TABLE_NAME,
+            Key={'PK': f"AREA#{area_config['area_id']}", 'SK': 'METADATA'},
+            UpdateExpression="SET max_capacity = :max_cap, #name = :name",
+            ExpressionAttributeNames={'#name': 'name'},
+            ExpressionAttributeValues={
+                ':max_cap': area_config['max_capacity'],
+                ':name': area_config['name']
+            }
+        )
+    
+    if existing_areas:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(update_area, existing_areas))
+    
+    for area_config in existing_areas:
+        print(f"  - {area_config['name']}: Already exists (keeping current count)")
+        updated_count += 1
     
     print(f"\n✓ Seeding complete: {created_count} created, {updated_count} updated")
 
 
-def verify_setup(table):
+def verify_setup(dynamodb, table):
     """
     Verify the database is set up correctly
     
+    Reads the seeded areas by primary key with one BatchGetItem call
+    rather than scanning the whole table.
+    
     Args:
+        dynamodb: boto3 DynamoDB resource
         table: DynamoDB table object
     """
     print("\nVerifying setup...")
     
-    # Scan for all areas
-    response = table.scan(
-        FilterExpression=boto3.dynamodb.conditions.Key('SK').eq('METADATA')
-    )
+    # Fetch all seeded areas
+    request_items = {
+        TABLE_NAME: {
+            'Keys': [
+                {'PK': f"AREA#{area_config['area_id']}", 'SK': 'METADATA'}
+                for area_config in INITIAL_AREAS
+            ]
+        }
+    }
     
-    items = response.get('Items', [])
+    items = []
+    while request_items:
+        response = dynamodb.batch_get_item(RequestItems=request_items)
+        items.extend(response.get('Responses', {}).get(TABLE_NAME, []))
+        request_items = response.get('UnprocessedKeys')
     
     print(f"✓ Found {len(items)} areas in database:")
     for item in items:
@@ -249,10 +295,10 @@ def main():
         table = create_dynamodb_table(dynamodb)
         
         # Seed initial data
-        seed_areas(table)
+        seed_areas(dynamodb, table)
         
         # Verify setup
-        success = verify_setup(table)
+        success = verify_setup(dynamodb, table)
         
         if success:
             print("\n" + "=" * 60)
@@ -9,24 +9,33 @@ This backend provides REST API endpoints for:
 Author: JMU Development Team
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from typing import List, Optional
 from datetime import datetime
+import asyncio
+import hashlib
 import logging
+import os
+import time
+
+import orjson
+from pydantic import ValidationError
 
 from models import (
     AreaCapacity,
     CapacityResponse,
     UpdateCapacityRequest,
-    HealthResponse
+    HealthResponse,
+    validate_update_request
 )
 from database import DynamoDBManager
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -37,7 +46,9 @@ app = FastAPI(
     description="Real-time capacity tracking for JMU UREC facilities",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # Serialize responses with orjson instead of the stdlib json module
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS to allow frontend access
@@ -50,18 +61,245 @@ app.add_middleware(
         # Add production frontend URL here
     ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Only what the frontend and iPads use; browsers cache the preflight
+    # for max_age seconds instead of repeating it before each POST
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type"],
+    max_age=86400,
 )
 
-# Initialize database manager
+# Initialize database manager (a module-level singleton used directly by
+# the handlers; tests can patch main.db_manager)
 db_manager = DynamoDBManager()
 
 
-# Dependency to get database manager
-def get_db_manager():
-    """Dependency injection for database manager"""
-    return db_manager
+# ISO timestamp of the current second, formatted once per second
+_now_iso = {"second": 0, "iso": ""}
+
+
+def now_iso() -> str:
+    """Current UTC time (ISO format, second precision) for response timestamps"""
+    second = int(time.time())
+    if second != _now_iso["second"]:
+        _now_iso["iso"] = datetime.utcfromtimestamp(second).isoformat()
+        _now_iso["second"] = second
+    return _now_iso["iso"]
+
+
+# GET / never changes, so its body is serialized once
+_ROOT_BODY = orjson.dumps({
+    "message": "JMU UREC Capacity Tracker API",
+    "version": "1.0.0",
+    "docs": "/docs",
+    "health": "/api/health"
+})
+
+# Last healthy GET /api/health body, reused for HEALTH_CACHE_TTL seconds
+HEALTH_CACHE_TTL = 1.0
+_health_cache = {"at": 0.0, "body": None}
+
+
+# Serialized GET /api/capacity body, reused by polling clients for
+# CAPACITY_CACHE_TTL seconds. Updates and resets invalidate it and bump
+# the generation, so a refresh that was already running doesn't publish
+# its older body as fresh.
+CAPACITY_CACHE_TTL = float(os.getenv('CAPACITY_CACHE_TTL', '2'))
+_capacity_cache = {"at": 0.0, "payload": None, "etag": None, "generation": 0}
+_capacity_cache_lock = asyncio.Lock()
+
+
+def _capacity_etag(counts: tuple) -> str:
+    """
+    Weak ETag for a /api/capacity body
+    
+    The tag is weak because it leaves out the timestamps, so bodies with
+    the same counts share it.
+    
+    Args:
+        counts: (area_id, name, current_count, max_capacity, is_open) per
+            area, so the server timestamp doesn't change the ETag
+    """
+    return 'W/"%s"' % hashlib.blake2b(repr(counts).encode(), digest_size=8).hexdigest()
+
+
+def _payload_etag(payload) -> str:
+    """ETag for a serialized /api/capacity body (e.g. one read from Redis)"""
+    return _capacity_etag(tuple(
+        (a["area_id"], a["name"], a["current_count"], a["max_capacity"], a["is_open"])
+        for a in orjson.loads(payload)["areas"]
+    ))
+
+
+def _store_capacity(payload, generation: int, etag: Optional[str] = None) -> bool:
+    """
+    Put a serialized /api/capacity body in the in-process cache
+    
+    The body is only marked fresh if the cache wasn't invalidated since
+    generation was read (i.e. while the body was being fetched).
+    
+    Args:
+        payload: Serialized CapacityResponse
+        generation: Cache generation read before the body was fetched
+        etag: The body's ETag (default: computed from the payload)
+    
+    Returns:
+        bool: True if the body was marked fresh
+    """
+    if payload != _capacity_cache["payload"]:
+        _capacity_cache["payload"] = payload
+        _capacity_cache["etag"] = etag or _payload_etag(payload)
+    if generation != _capacity_cache["generation"]:
+        return False
+    _capacity_cache["at"] = time.monotonic()
+    return True
+
+
+def _local_capacity_fresh() -> bool:
+    """Whether the in-process body can be served (never when Redis is used)"""
+    return (
+        redis_client is None
+        and time.monotonic() - _capacity_cache["at"] < CAPACITY_CACHE_TTL
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag
+    
+    Uses weak comparison (RFC 9110), so a W/ prefix on either side is
+    ignored, e.g. when a proxy weakens the tag after compressing the body.
+    """
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag == "*" or tag.removeprefix("W/") == opaque
+        for tag in (t.strip() for t in if_none_match.split(","))
+    )
+
+
+def _cached_capacity_response(request: Request) -> Response:
+    """Response for the cached /api/capacity body (304 if the client has it)"""
+    headers = {"ETag": _capacity_cache["etag"]}
+    if _etag_matches(request.headers.get("if-none-match"), _capacity_cache["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=_capacity_cache["payload"],
+        media_type="application/json",
+        headers=headers
+    )
+
+# Optional Redis cache shared by all workers (set REDIS_URL to enable), so
+# an update handled by one worker invalidates the responses of the others.
+# With Redis, it is the only response cache: the in-process body just
+# backs the ETag. Invalidations bump a version key, and a body fetched
+# from DynamoDB is only stored if the version hasn't changed since.
+REDIS_URL = os.getenv('REDIS_URL')
+REDIS_PREFIX = "urec:capacity"
+REDIS_LIST_KEY = f"{REDIS_PREFIX}:list"
+REDIS_VERSION_KEY = f"{REDIS_PREFIX}:version"
+redis_client = None
+_redis_set_if_current = None
+
+# SET KEYS[2] only while KEYS[1] (the version) still equals ARGV[1]
+_REDIS_SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[1]) or '0') == ARGV[1] then
+    return redis.call('SET', KEYS[2], ARGV[2], 'PX', ARGV[3])
+end
+return nil
+"""
+
+
+def _redis_area_key(area_id: str) -> str:
+    """Redis key of a cached /api/capacity/{area_id} body"""
+    return f"{REDIS_PREFIX}:area:{area_id}"
+
+
+async def _redis_get(key: str) -> Optional[bytes]:
+    """Get a cached response body from Redis (None on miss or error)"""
+    if redis_client is None:
+        return None
+    
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.warning("Redis get failed: %s", e)
+        return None
+
+
+async def _redis_version() -> Optional[bytes]:
+    """Current cache version, read before fetching a body to store (None if unavailable)"""
+    if redis_client is None:
+        return None
+    
+    try:
+        return await redis_client.get(REDIS_VERSION_KEY) or b"0"
+    except Exception as e:
+        logger.warning("Redis get failed: %s", e)
+        return None
+
+
+async def _redis_set(key: str, payload: bytes, version: Optional[bytes]):
+    """
+    Cache a response body in Redis for CAPACITY_CACHE_TTL seconds
+    
+    Skipped if the cache was invalidated since version was read, so a
+    body fetched before an update can't replace the newer data.
+    """
+    if redis_client is None or version is None:
+        return
+    
+    try:
+        await _redis_set_if_current(
+            keys=[REDIS_VERSION_KEY, key],
+            args=[version, payload, int(CAPACITY_CACHE_TTL * 1000)]
+        )
+    except Exception as e:
+        logger.warning("Redis set failed: %s", e)
+
+
+async def invalidate_capacity_cache(area_id: str):
+    """Force the next capacity reads for an area to go to DynamoDB"""
+    _capacity_cache["at"] = 0.0
+    _capacity_cache["generation"] += 1
+    
+    if redis_client is None:
+        return
+    
+    try:
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(REDIS_VERSION_KEY)
+            pipe.delete(REDIS_LIST_KEY, _redis_area_key(area_id))
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Redis invalidation failed: %s", e)
+
+
+async def get_update_request(request: Request) -> UpdateCapacityRequest:
+    """
+    Dependency that parses and validates the /api/update request body
+    
+    Errors are raised as RequestValidationError, so they get FastAPI's
+    usual 422 response with a list of error details.
+    """
+    try:
+        raw = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise RequestValidationError([{
+            "type": "json_invalid",
+            "loc": ("body", e.pos),
+            "msg": "JSON decode error",
+            "input": {},
+            "ctx": {"error": e.msg}
+        }])
+    
+    try:
+        return validate_update_request(raw)
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors()
+        ])
 
 
 @app.on_event("startup")
@@ -70,65 +308,103 @@ async def startup_event():
     logger.info("Starting UREC Capacity API...")
     logger.info("Connecting to DynamoDB...")
     
-    # Verify DynamoDB connection
+    # Open the DynamoDB connection and verify it
     try:
+        await db_manager.connect()
         await db_manager.verify_connection()
         logger.info("DynamoDB connection verified")
     except Exception as e:
-        logger.error(f"Failed to connect to DynamoDB: {e}")
+        logger.error("Failed to connect to DynamoDB: %s", e)
         # In production, you might want to fail fast here
+    
+    # Buffered updates are written after the request that made them
+    # returns; drop the responses cached in between once they land
+    db_manager.on_flush = invalidate_capacity_cache
+    
+    global redis_client, _redis_set_if_current
+    if REDIS_URL:
+        try:
+            # Optional dependency, only needed when Redis is configured
+            import redis.asyncio as redis
+            
+            redis_client = redis.from_url(REDIS_URL)
+            await redis_client.ping()
+            _redis_set_if_current = redis_client.register_script(_REDIS_SET_IF_CURRENT)
+            logger.info("Redis response cache connected")
+        except Exception as e:
+            # Serve from the in-process cache and DynamoDB only
+            logger.error("Failed to connect to Redis: %s", e)
+            redis_client = None
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on application shutdown"""
     logger.info("Shutting down UREC Capacity API...")
+    await db_manager.close()
+    
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
 
 
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API information"""
-    return {
-        "message": "JMU UREC Capacity Tracker API",
-        "version": "1.0.0",
-        "docs": "/docs",
-        "health": "/api/health"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
-@app.get("/api/health", response_model=HealthResponse, tags=["Health"])
-async def health_check(db: DynamoDBManager = Depends(get_db_manager)):
+@app.get("/api/health", responses={200: {"model": HealthResponse}}, tags=["Health"])
+async def health_check():
     """
     Health check endpoint
     
+    A healthy result is reused for HEALTH_CACHE_TTL seconds, so frequent
+    load balancer checks don't each verify the database connection.
+    
     Returns:
         HealthResponse: API and database health status
     """
+    if time.monotonic() - _health_cache["at"] < HEALTH_CACHE_TTL:
+        return Response(content=_health_cache["body"], media_type="application/json")
+    
     try:
         # Check database connection
-        db_healthy = await db.verify_connection()
+        db_healthy = await db_manager.verify_connection()
         
-        return HealthResponse(
+        health = HealthResponse(
             status="healthy" if db_healthy else "degraded",
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=now_iso(),
             database_connected=db_healthy
         )
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return HealthResponse(
+        logger.error("Health check failed: %s", e)
+        health = HealthResponse(
             status="unhealthy",
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=now_iso(),
             database_connected=False
         )
-
-
-@app.get("/api/capacity", response_model=CapacityResponse, tags=["Capacity"])
-async def get_all_capacity(db: DynamoDBManager = Depends(get_db_manager)):
+    
+    body = health.model_dump_json()
+    # Only cache a healthy result so problems are reported immediately
+    if health.database_connected:
+        _health_cache["body"] = body
+        _health_cache["at"] = time.monotonic()
+    return Response(content=body, media_type="application/json")
+
+
+# The hot endpoints return pre-serialized bodies; the models only document
+# the schema, so FastAPI doesn't validate and re-encode the response
+@app.get("/api/capacity", responses={200: {"model": CapacityResponse}}, tags=["Capacity"])
+async def get_all_capacity(request: Request):
     """
     Get current capacity for all UREC areas
     
     This endpoint returns real-time capacity data for all tracked areas
-    in the UREC facility. Data is fetched from DynamoDB.
+    in the UREC facility. Data is fetched from DynamoDB and cached for
+    CAPACITY_CACHE_TTL seconds. Responses carry an ETag; polls with a
+    matching If-None-Match get an empty 304.
     
     Returns:
         CapacityResponse: Current capacity for all areas
@@ -137,34 +413,62 @@ async def get_all_capacity(db: DynamoDBManager = Depends(get_db_manager)):
         HTTPException: If database query fails
     """
     try:
-        logger.info("Fetching capacity for all areas")
-        
-        # Fetch all areas from DynamoDB
-        areas = await db.get_all_areas()
+        if _local_capacity_fresh():
+            return _cached_capacity_response(request)
         
-        # If no data in database, return mock data for demo
-        if not areas:
-            logger.warning("No capacity data found in database, using mock data")
-            areas = get_mock_capacity_data()
+        payload = await _redis_get(REDIS_LIST_KEY)
+        if payload is not None:
+            _store_capacity(payload, _capacity_cache["generation"])
+            return _cached_capacity_response(request)
         
-        return CapacityResponse(
-            timestamp=datetime.utcnow().isoformat(),
-            areas=areas
-        )
+        # Only one request refreshes the cache; the rest wait and reuse it
+        async with _capacity_cache_lock:
+            if _local_capacity_fresh():
+                return _cached_capacity_response(request)
+            
+            generation = _capacity_cache["generation"]
+            
+            # Another request may have fetched it meanwhile
+            payload = await _redis_get(REDIS_LIST_KEY)
+            if payload is not None:
+                _store_capacity(payload, generation)
+                return _cached_capacity_response(request)
+            
+            version = await _redis_version()
+            logger.info("Fetching capacity for all areas")
+            
+            # Fetch all areas from DynamoDB
+            areas = await db_manager.get_all_areas()
+            
+            # If no data in database, return mock data for demo
+            if not areas:
+                logger.warning("No capacity data found in database, using mock data")
+                areas = get_mock_capacity_data()
+            
+            response = CapacityResponse(
+                timestamp=now_iso(),
+                areas=areas
+            )
+            
+            etag = _capacity_etag(tuple(
+                (a.area_id, a.name, a.current_count, a.max_capacity, a.is_open)
+                for a in areas
+            ))
+            if _store_capacity(response.model_dump_json(), generation, etag):
+                await _redis_set(REDIS_LIST_KEY, _capacity_cache["payload"], version)
+            
+            return _cached_capacity_response(request)
         
     except Exception as e:
-        logger.error(f"Error fetching capacity data: {e}")
+        logger.error("Error fetching capacity data: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch capacity data: {str(e)}"
         )
 
 
-@app.get("/api/capacity/{area_id}", response_model=AreaCapacity, tags=["Capacity"])
-async def get_area_capacity(
-    area_id: str,
-    db: DynamoDBManager = Depends(get_db_manager)
-):
+@app.get("/api/capacity/{area_id}", responses={200: {"model": AreaCapacity}}, tags=["Capacity"])
+async def get_area_capacity(area_id: str):
     """
     Get current capacity for a specific UREC area
     
@@ -178,10 +482,15 @@ async def get_area_capacity(
         HTTPException: If area not found or database query fails
     """
     try:
-        logger.info(f"Fetching capacity for area: {area_id}")
+        payload = await _redis_get(_redis_area_key(area_id))
+        if payload is not None:
+            return Response(content=payload, media_type="application/json")
+        
+        version = await _redis_version()
+        logger.info("Fetching capacity for area: %s", area_id)
         
         # Fetch specific area from DynamoDB
-        area = await db.get_area(area_id)
+        area = await db_manager.get_area(area_id)
         
         if not area:
             raise HTTPException(
@@ -189,22 +498,35 @@ async def get_area_capacity(
                 detail=f"Area '{area_id}' not found"
             )
         
-        return area
+        payload = area.model_dump_json()
+        await _redis_set(_redis_area_key(area_id), payload, version)
+        return Response(content=payload, media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching area capacity: {e}")
+        logger.error("Error fetching area capacity: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch area capacity: {str(e)}"
         )
 
 
-@app.post("/api/update", tags=["Capacity"])
+@app.post(
+    "/api/update",
+    tags=["Capacity"],
+    # The body is validated by get_update_request; document its schema
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": UpdateCapacityRequest.model_json_schema()}
+            },
+            "required": True
+        }
+    }
+)
 async def update_capacity(
-    request: UpdateCapacityRequest,
-    db: DynamoDBManager = Depends(get_db_manager)
+    request: UpdateCapacityRequest = Depends(get_update_request)
 ):
     """
     Update capacity for a specific area
@@ -223,7 +545,7 @@ async def update_capacity(
         HTTPException: If update fails
     """
     try:
-        logger.info(f"Updating capacity for {request.area_id}: {request.action}")
+        logger.info("Updating capacity for %s: %s", request.area_id, request.action)
         
         # Validate action
         if request.action not in ["enter", "exit"]:
@@ -233,10 +555,12 @@ async def update_capacity(
             )
         
         # Update the capacity in DynamoDB
-        updated_area = await db.update_capacity(
+        updated_area = await db_manager.update_capacity(
             area_id=request.area_id,
-            action=request.action
+            action=request.action,
+            count=request.count
         )
+        await invalidate_capacity_cache(request.area_id)
         
         if not updated_area:
             raise HTTPException(
@@ -249,13 +573,13 @@ async def update_capacity(
             "area_id": request.area_id,
             "action": request.action,
             "new_count": updated_area.current_count,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating capacity: {e}")
+        logger.error("Error updating capacity: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update capacity: {str(e)}"
@@ -265,8 +589,7 @@ async def update_capacity(
 @app.post("/api/reset/{area_id}", tags=["Admin"])
 async def reset_area_capacity(
     area_id: str,
-    count: int = 0,
-    db: DynamoDBManager = Depends(get_db_manager)
+    count: int = 0
 ):
     """
     Reset capacity count for a specific area (admin function)
@@ -279,10 +602,11 @@ async def reset_area_capacity(
         dict: Success message with new count
     """
     try:
-        logger.info(f"Resetting capacity for {area_id} to {count}")
+        logger.info("Resetting capacity for %s to %s", area_id, count)
         
         # Update the count directly
-        updated_area = await db.set_capacity(area_id, count)
+        updated_area = await db_manager.set_capacity(area_id, count)
+        await invalidate_capacity_cache(area_id)
         
         if not updated_area:
             raise HTTPException(
@@ -294,22 +618,76 @@ async def reset_area_capacity(
             "success": True,
             "area_id": area_id,
             "new_count": count,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error resetting capacity: {e}")
+        logger.error("Error resetting capacity: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to reset capacity: {str(e)}"
         )
 
 
+# Static demo data, built once at import
+_MOCK_TIMESTAMP = datetime.utcnow().isoformat()
+_MOCK_AREAS = (
+    AreaCapacity(
+        area_id="weight-room",
+        name="Weight Room",
+        current_count=45,
+        max_capacity=100,
+        is_open=True,
+        last_updated=_MOCK_TIMESTAMP
+    ),
+    AreaCapacity(
+        area_id="cardio",
+        name="Cardio Area",
+        current_count=32,
+        max_capacity=60,
+        is_open=True,
+        last_updated=_MOCK_TIMESTAMP
+    ),
+    AreaCapacity(
+        area_id="track",
+        name="Indoor Track",
+        current_count=18,
+        max_capacity=50,
+        is_open=True,
+        last_updated=_MOCK_TIMESTAMP
+    ),
+    AreaCapacity(
+        area_id="pool",
+        name="Swimming Pool",
+        current_count=12,
+        max_capacity=40,
+        is_open=True,
+        last_updated=_MOCK_TIMESTAMP
+    ),
+    AreaCapacity(
+        area_id="basketball",
+        name="Basketball Courts",
+        current_count=24,
+        max_capacity=30,
+        is_open=True,
+        last_updated=_MOCK_TIMESTAMP
+    ),
+    AreaCapacity(
+        area_id="climbing",
+        name="Climbing Wall",
+        current_count=8,
+        max_capacity=15,
+        is_open=True,
+        last_updated=_MOCK_TIMESTAMP
+    )
+)
+
+
 def get_mock_capacity_data() -> List[AreaCapacity]:
     """
-    Generate mock capacity data for demonstration
+    Get mock capacity data for demonstration
     
     This is used when the database is not available or empty.
     In production, this would be replaced with actual data.
@@ -317,63 +695,14 @@ def get_mock_capacity_data() -> List[AreaCapacity]:
     Returns:
         List[AreaCapacity]: Mock capacity data
     """
-    return [
-        AreaCapacity(
-            area_id="weight-room",
-            name="Weight Room",
-            current_count=45,
-            max_capacity=100,
-            is_open=True,
-            last_updated=datetime.utcnow().isoformat()
-        ),
-        AreaCapacity(
-            area_id="cardio",
-            name="Cardio Area",
-            current_count=32,
-            max_capacity=60,
-            is_open=True,
-            last_updated=datetime.utcnow().isoformat()
-        ),
-        AreaCapacity(
-            area_id="track",
-            name="Indoor Track",
-            current_count=18,
-            max_capacity=50,
-            is_open=True,
-            last_updated=datetime.utcnow().isoformat()
-        ),
-        AreaCapacity(
-            area_id="pool",
-            name="Swimming Pool",
-            current_count=12,
-            max_capacity=40,
-            is_open=True,
-            last_updated=datetime.utcnow().isoformat()
-        ),
-        AreaCapacity(
-            area_id="basketball",
-            name="Basketball Courts",
-            current_count=24,
-            max_capacity=30,
-            is_open=True,
-            last_updated=datetime.utcnow().isoformat()
-        ),
-        AreaCapacity(
-            area_id="climbing",
-            name="Climbing Wall",
-            current_count=8,
-            max_capacity=15,
-            is_open=True,
-            last_updated=datetime.utcnow().isoformat()
-        )
-    ]
+    return list(_MOCK_AREAS)
 
 
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
     """Custom 404 error handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={"detail": "Resource not found"}
     )
@@ -382,8 +711,8 @@ async def not_found_handler(request, exc):
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     """Custom 500 error handler"""
-    logger.error(f"Internal server error: {exc}")
-    return JSONResponse(
+    logger.error("Internal server error: %s", exc)
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
@@ -5,7 +5,7 @@ Pydantic models for request/response validation and data structure.
 These models ensure type safety and automatic validation.
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationInfo, field_validator
 from typing import List, Optional
 from datetime import datetime
 
@@ -25,46 +25,47 @@ class AreaCapacity(BaseModel):
     area_id: str = Field(
         ...,
         description="Unique identifier for the area",
-        example="weight-room"
+        examples=["weight-room"]
     )
     name: str = Field(
         ...,
         description="Display name of the area",
-        example="Weight Room"
+        examples=["Weight Room"]
     )
     current_count: int = Field(
         ...,
         ge=0,
         description="Current number of people in the area",
-        example=45
+        examples=[45]
     )
     max_capacity: int = Field(
         ...,
         gt=0,
         description="Maximum capacity for the area",
-        example=100
+        examples=[100]
     )
     is_open: bool = Field(
         default=True,
         description="Whether the area is currently open",
-        example=True
+        examples=[True]
     )
     last_updated: str = Field(
         default_factory=lambda: datetime.utcnow().isoformat(),
         description="ISO timestamp of last update",
-        example="2024-02-07T14:30:00.000Z"
+        examples=["2024-02-07T14:30:00.000Z"]
     )
     
-    @validator('current_count')
-    def validate_current_count(cls, v, values):
+    @field_validator('current_count')
+    @classmethod
+    def validate_current_count(cls, v, info: ValidationInfo):
         """Ensure current count doesn't exceed max capacity"""
-        if 'max_capacity' in values and v > values['max_capacity']:
+        if 'max_capacity' in info.data and v > info.data['max_capacity']:
             # Allow it but log a warning in production
             pass
         return v
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "area_id": "weight-room",
                 "name": "Weight Room",
@@ -74,6 +75,7 @@ class AreaCapacity(BaseModel):
                 "last_updated": "2024-02-07T14:30:00.000Z"
             }
         }
+    )
 
 
 class CapacityResponse(BaseModel):
@@ -87,15 +89,15 @@ class CapacityResponse(BaseModel):
     timestamp: str = Field(
         ...,
         description="Current server timestamp (ISO format)",
-        example="2024-02-07T14:30:00.000Z"
+        examples=["2024-02-07T14:30:00.000Z"]
     )
     areas: List[AreaCapacity] = Field(
         ...,
         description="List of capacity data for all areas"
     )
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "timestamp": "2024-02-07T14:30:00.000Z",
                 "areas": [
@@ -118,6 +120,7 @@ class CapacityResponse(BaseModel):
                 ]
             }
         }
+    )
 
 
 class UpdateCapacityRequest(BaseModel):
@@ -133,35 +136,36 @@ class UpdateCapacityRequest(BaseModel):
     area_id: str = Field(
         ...,
         description="Area identifier to update",
-        example="weight-room"
+        examples=["weight-room"]
     )
     action: str = Field(
         ...,
         description="Action to perform: 'enter' or 'exit'",
-        example="enter"
+        examples=["enter"]
     )
     count: int = Field(
         default=1,
         ge=1,
         le=10,
         description="Number of people entering/exiting (default: 1)",
-        example=1
+        examples=[1]
     )
     timestamp: Optional[str] = Field(
         default=None,
         description="Client timestamp (ISO format)",
-        example="2024-02-07T14:30:00.000Z"
+        examples=["2024-02-07T14:30:00.000Z"]
     )
     
-    @validator('action')
+    @field_validator('action')
+    @classmethod
     def validate_action(cls, v):
         """Ensure action is either 'enter' or 'exit'"""
         if v.lower() not in ['enter', 'exit']:
             raise ValueError("Action must be 'enter' or 'exit'")
         return v.lower()
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "area_id": "weight-room",
                 "action": "enter",
@@ -169,6 +173,52 @@ class UpdateCapacityRequest(BaseModel):
                 "timestamp": "2024-02-07T14:30:00.000Z"
             }
         }
+    )
+
+
+_UPDATE_ACTIONS = frozenset(('enter', 'exit'))
+
+
+def validate_update_request(raw) -> UpdateCapacityRequest:
+    """
+    Validate a raw update request body, skipping Pydantic for typical bodies
+    
+    Bodies with exactly-typed, valid fields are checked with direct dict
+    access on the per-tap /api/update path. Anything else goes through
+    UpdateCapacityRequest.model_validate, so coercions (e.g. count "3")
+    and error details are the same as the model's.
+    
+    Args:
+        raw: Decoded JSON request body
+    
+    Returns:
+        UpdateCapacityRequest: The validated request
+    
+    Raises:
+        ValidationError: If the body is invalid
+    """
+    if isinstance(raw, dict):
+        area_id = raw.get('area_id')
+        action = raw.get('action')
+        count = raw.get('count', 1)
+        timestamp = raw.get('timestamp')
+        
+        if (
+            type(area_id) is str
+            and type(action) is str
+            and action.lower() in _UPDATE_ACTIONS
+            and type(count) is int
+            and 1 <= count <= 10
+            and (timestamp is None or type(timestamp) is str)
+        ):
+            return UpdateCapacityRequest.model_construct(
+                area_id=area_id,
+                action=action.lower(),
+                count=count,
+                timestamp=timestamp
+            )
+    
+    return UpdateCapacityRequest.model_validate(raw)
 
 
 class HealthResponse(BaseModel):
@@ -183,27 +233,28 @@ class HealthResponse(BaseModel):
     status: str = Field(
         ...,
         description="Health status: 'healthy', 'degraded', or 'unhealthy'",
-        example="healthy"
+        examples=["healthy"]
     )
     timestamp: str = Field(
         ...,
         description="Current server timestamp (ISO format)",
-        example="2024-02-07T14:30:00.000Z"
+        examples=["2024-02-07T14:30:00.000Z"]
     )
     database_connected: bool = Field(
         ...,
         description="Whether database connection is active",
-        example=True
+        examples=[True]
     )
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "timestamp": "2024-02-07T14:30:00.000Z",
                 "database_connected": True
             }
         }
+    )
 
 
 class DynamoDBItem(BaseModel):
@@ -219,11 +270,11 @@ class DynamoDBItem(BaseModel):
     current_count: int
     max_capacity: int
     is_open: bool
-    last_updated: str
+    last_updated: int = Field(..., description="Epoch milliseconds of last update")
     created_at: Optional[str] = None
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "PK": "AREA#weight-room",
                 "SK": "METADATA",
@@ -232,10 +283,11 @@ class DynamoDBItem(BaseModel):
                 "current_count": 45,
                 "max_capacity": 100,
                 "is_open": True,
-                "last_updated": "2024-02-07T14:30:00.000Z",
+                "last_updated": 1707316200000,
                 "created_at": "2024-01-01T00:00:00.000Z"
             }
         }
+    )
 
 
 class LambdaEvent(BaseModel):
@@ -251,8 +303,8 @@ class LambdaEvent(BaseModel):
     timestamp: Optional[str] = None
     source: Optional[str] = Field(default="ipad", description="Event source")
     
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "area_id": "weight-room",
                 "action": "enter",
@@ -261,3 +313,4 @@ class LambdaEvent(BaseModel):
                 "source": "ipad"
             }
         }
+    )
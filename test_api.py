@@ -6,7 +6,10 @@ Run with: pytest test_api.py -v
 
 import pytest
 from fastapi.testclient import TestClient
+from botocore.exceptions import ClientError
+from pydantic import ValidationError
 from datetime import datetime
+import asyncio
 import sys
 import os
 
@@ -14,7 +17,17 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
 
 from main import app
-from models import AreaCapacity, CapacityResponse, UpdateCapacityRequest
+from models import (
+    AreaCapacity,
+    CapacityResponse,
+    UpdateCapacityRequest,
+    validate_update_request
+)
+from database import DynamoDBManager
+
+# The Lambda module creates its boto3 client on import
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+import capacity_updater
 
 # Create test client
 client = TestClient(app)
@@ -79,6 +92,47 @@ class TestCapacityEndpoints:
             for field in required_fields:
                 assert field in area
     
+    def test_get_all_capacity_has_etag(self):
+        """GET /api/capacity should return an ETag header"""
+        response = client.get("/api/capacity")
+        assert response.status_code == 200
+        assert response.headers.get("etag")
+    
+    def test_get_all_capacity_not_modified(self):
+        """GET /api/capacity with a matching If-None-Match should return 304"""
+        etag = client.get("/api/capacity").headers["etag"]
+        
+        response = client.get("/api/capacity", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+    
+    def test_get_all_capacity_etag_is_weak(self):
+        """The ETag should be weak since it leaves out the timestamps"""
+        etag = client.get("/api/capacity").headers["etag"]
+        assert etag.startswith('W/"')
+    
+    def test_get_all_capacity_not_modified_weak_comparison(self):
+        """If-None-Match should match regardless of the W/ prefix"""
+        etag = client.get("/api/capacity").headers["etag"]
+        
+        response = client.get("/api/capacity", headers={"If-None-Match": etag[2:]})
+        assert response.status_code == 304
+    
+    def test_get_all_capacity_not_modified_tag_list(self):
+        """If-None-Match with a list of tags or * should return 304"""
+        etag = client.get("/api/capacity").headers["etag"]
+        
+        for header in ('"other", ' + etag, 'W/"other",%s' % etag, "*"):
+            response = client.get("/api/capacity", headers={"If-None-Match": header})
+            assert response.status_code == 304
+    
+    def test_get_all_capacity_stale_etag(self):
+        """GET /api/capacity with an outdated If-None-Match should return the body"""
+        response = client.get("/api/capacity", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert "areas" in response.json()
+    
     def test_get_specific_area_with_valid_id(self):
         """GET /api/capacity/{area_id} with valid ID should return area"""
         # First get all areas to find a valid ID
@@ -190,6 +244,45 @@ class TestUpdateEndpoint:
             }
         )
         assert response.status_code in [400, 422]
+    
+    def test_update_accepts_coercible_count(self):
+        """POST /api/update should coerce count like the model ("3", 3.0)"""
+        for count in ["3", 3.0]:
+            response = client.post(
+                "/api/update",
+                json={
+                    "area_id": "weight-room",
+                    "action": "enter",
+                    "count": count
+                }
+            )
+            assert response.status_code in [200, 404, 500]
+    
+    def test_update_validation_error_detail(self):
+        """POST /api/update validation errors should list the failing fields"""
+        response = client.post(
+            "/api/update",
+            json={
+                "area_id": "weight-room",
+                "action": "enter",
+                "count": 3.5
+            }
+        )
+        assert response.status_code == 422
+        
+        detail = response.json()["detail"]
+        assert isinstance(detail, list)
+        assert detail[0]["loc"] == ["body", "count"]
+    
+    def test_update_rejects_malformed_json(self):
+        """POST /api/update with invalid JSON should return 422"""
+        response = client.post(
+            "/api/update",
+            content=b"{bad",
+            headers={"Content-Type": "application/json"}
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["type"] == "json_invalid"
 
 
 class TestResetEndpoint:
@@ -207,6 +300,353 @@ class TestResetEndpoint:
         assert response.status_code in [200, 404, 500]
 
 
+class StubDynamoDB:
+    """
+    In-memory stand-in for the low-level DynamoDB client, holding one
+    unsharded area. Counter writes can be made to fail or to pause after
+    they are applied (before the response is returned).
+    """
+    
+    def __init__(self, count=0):
+        self.count = count
+        self.max_capacity = 40
+        self.writes = 0
+        self.reads = 0
+        self.fail_writes = 0
+        self.fail_reads = 0
+        self.hold = None
+        self.applied = asyncio.Event()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def _item(self):
+        return {
+            'PK': {'S': 'AREA#pool'},
+            'SK': {'S': 'METADATA'},
+            'area_id': {'S': 'pool'},
+            'name': {'S': 'Swimming Pool'},
+            'max_capacity': {'N': str(self.max_capacity)},
+            'is_open': {'BOOL': True},
+            'current_count': {'N': str(self.count)},
+            'last_updated': {'N': '1700000000000'}
+        }
+    
+    def _project(self, ProjectionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        item = self._item()
+        if ProjectionExpression is None:
+            return item
+        names = ExpressionAttributeNames or {}
+        fields = [names.get(f.strip(), f.strip()) for f in ProjectionExpression.split(',')]
+        return {field: value for field, value in item.items() if field in fields}
+    
+    async def get_item(self, Key, **kwargs):
+        self.reads += 1
+        if self.fail_reads:
+            self.fail_reads -= 1
+            raise ClientError({'Error': {'Code': 'InternalServerError'}}, 'GetItem')
+        return {'Item': self._project(**kwargs)} if Key['PK']['S'] == 'AREA#pool' else {}
+    
+    async def batch_get_item(self, RequestItems):
+        self.reads += 1
+        (table, request), = RequestItems.items()
+        found = [self._project(**request) for key in request['Keys'] if key['PK']['S'] == 'AREA#pool']
+        return {'Responses': {table: found}}
+    
+    async def update_item(self, ExpressionAttributeValues, **kwargs):
+        self.writes += 1
+        if self.fail_writes:
+            self.fail_writes -= 1
+            raise ClientError({'Error': {'Code': 'InternalServerError'}}, 'UpdateItem')
+        
+        values = ExpressionAttributeValues
+        if ':delta' in values:
+            if ':cnt' in values and self.count < int(values[':cnt']['N']):
+                raise ClientError(
+                    {'Error': {'Code': 'ConditionalCheckFailedException'}, 'Item': self._item()},
+                    'UpdateItem'
+                )
+            self.count += int(values[':delta']['N'])
+        elif ':zero' in values:
+            self.count = 0
+        else:
+            self.count = int(values[':count']['N'])
+        
+        self.applied.set()
+        if self.hold is not None:
+            await self.hold.wait()
+        return {'Attributes': self._item()}
+
+
+async def buffered_manager(stub):
+    """DynamoDBManager on the stub client with a flusher that never fires"""
+    manager = DynamoDBManager()
+    manager.session.client = lambda *args, **kwargs: stub
+    manager.counter_shards = 1
+    manager.dax_endpoint = None
+    manager.update_debounce = 3600
+    await manager.connect()
+    return manager
+
+
+class TestUpdateBuffer:
+    """Test suite for debounced capacity updates (stubbed DynamoDB client)"""
+    
+    def test_updates_are_written_in_one_flush(self):
+        """Buffered updates should be counted at once and written together"""
+        async def scenario():
+            stub = StubDynamoDB(count=5)
+            manager = await buffered_manager(stub)
+            
+            counts = [
+                (await manager.update_capacity('pool', 'enter')).current_count
+                for _ in range(3)
+            ]
+            reads = stub.reads
+            exit_count = (await manager.update_capacity('pool', 'exit')).current_count
+            assert counts == [6, 7, 8]
+            assert exit_count == 7
+            # Only the first update reads the stored count
+            assert stub.reads == reads
+            assert stub.writes == 0
+            
+            await manager.flush_updates()
+            assert stub.writes == 1
+            assert stub.count == 7
+            assert (await manager.get_area('pool')).current_count == 7
+            await manager.close()
+        
+        asyncio.run(scenario())
+    
+    def test_failed_write_is_retried(self):
+        """A failed flush should keep the delta buffered for the next one"""
+        async def scenario():
+            stub = StubDynamoDB()
+            manager = await buffered_manager(stub)
+            
+            await manager.update_capacity('pool', 'enter', 2)
+            stub.fail_writes = 1
+            await manager.flush_updates()
+            assert stub.count == 0
+            assert (await manager.get_area('pool')).current_count == 2
+            
+            await manager.flush_updates()
+            assert stub.count == 2
+            assert (await manager.get_area('pool')).current_count == 2
+            await manager.close()
+        
+        asyncio.run(scenario())
+    
+    def test_stale_count_is_read_again(self):
+        """A count written elsewhere should show up once the cached one expires"""
+        async def scenario():
+            stub = StubDynamoDB(count=10)
+            manager = await buffered_manager(stub)
+            manager.known_count_ttl = 0.05
+            
+            assert (await manager.update_capacity('pool', 'enter')).current_count == 11
+            await manager.flush_updates()
+            
+            # Another worker (or the Lambda) moves the stored count
+            stub.count = 50
+            await asyncio.sleep(0.1)
+            assert (await manager.update_capacity('pool', 'enter')).current_count == 51
+            await manager.close()
+            assert stub.count == 51
+        
+        asyncio.run(scenario())
+    
+    def test_failed_read_does_not_buffer_update(self):
+        """An update whose count read fails should not be written later"""
+        async def scenario():
+            stub = StubDynamoDB(count=4)
+            manager = await buffered_manager(stub)
+            await manager._get_metadata('pool')
+            
+            stub.fail_reads = 1
+            with pytest.raises(ClientError):
+                await manager.update_capacity('pool', 'enter')
+            
+            await manager.flush_updates()
+            assert stub.writes == 0
+            assert stub.count == 4
+            await manager.close()
+        
+        asyncio.run(scenario())
+    
+    def test_reset_during_flush_keeps_later_updates(self):
+        """A reset should wait for an in-flight flush and keep newer taps"""
+        async def scenario():
+            stub = StubDynamoDB()
+            manager = await buffered_manager(stub)
+            
+            await manager.update_capacity('pool', 'enter', 3)
+            stub.hold = asyncio.Event()
+            flush = asyncio.create_task(manager.flush_updates())
+            await stub.applied.wait()
+            
+            # The write has landed but not returned; reads must not count it twice
+            assert (await manager.get_area('pool')).current_count == 3
+            
+            reset = asyncio.create_task(manager.set_capacity('pool', 0))
+            await asyncio.sleep(0)
+            await manager.update_capacity('pool', 'enter')
+            
+            stub.hold.set()
+            await flush
+            assert (await reset).current_count == 1
+            
+            await manager.flush_updates()
+            assert stub.count == 1
+            assert (await manager.get_area('pool')).current_count == 1
+            await manager.close()
+        
+        asyncio.run(scenario())
+
+
+class TestAreaMetadataCache:
+    """Test suite for the static area field cache (stubbed DynamoDB client)"""
+    
+    def test_metadata_expires_while_area_is_read(self):
+        """Counter-only reads should not keep cached metadata alive"""
+        async def scenario():
+            stub = StubDynamoDB(count=5)
+            manager = await buffered_manager(stub)
+            manager.metadata_ttl = 0.05
+            
+            assert (await manager.get_area('pool')).max_capacity == 40
+            stub.max_capacity = 60
+            for _ in range(5):
+                await manager.get_area('pool')
+                await asyncio.sleep(0.02)
+            
+            assert (await manager.get_area('pool')).max_capacity == 60
+            await manager.close()
+        
+        asyncio.run(scenario())
+    
+    def test_unknown_area_is_not_read_again(self):
+        """Repeated updates for an unknown area should share one read"""
+        async def scenario():
+            stub = StubDynamoDB()
+            manager = await buffered_manager(stub)
+            
+            for _ in range(5):
+                assert await manager.update_capacity('bogus', 'enter') is None
+            
+            assert stub.reads == 1
+            await manager.close()
+        
+        asyncio.run(scenario())
+
+
+class StubTransactClient:
+    """
+    Stand-in for the Lambda's boto3 DynamoDB client. Records each
+    TransactWriteItems call; calls touching fail_areas fail, and the
+    first call is cancelled with cancel_reasons if they are set.
+    """
+    
+    def __init__(self, areas=('pool',)):
+        self.areas = set(areas)
+        self.calls = []
+        self.fail_areas = set()
+        self.cancel_reasons = None
+    
+    def get_item(self, Key, **kwargs):
+        area_id = Key['PK']['S'].split('#', 1)[1]
+        return {'Item': {'PK': Key['PK']}} if area_id in self.areas else {}
+    
+    def transact_write_items(self, TransactItems, ClientRequestToken=None):
+        self.calls.append((TransactItems, ClientRequestToken))
+        area_ids = {i['Update']['Key']['PK']['S'].split('#')[1] for i in TransactItems}
+        if area_ids & self.fail_areas:
+            raise ClientError({'Error': {'Code': 'InternalServerError'}}, 'TransactWriteItems')
+        if self.cancel_reasons is not None:
+            reasons, self.cancel_reasons = self.cancel_reasons, None
+            raise ClientError(
+                {'Error': {'Code': 'TransactionCanceledException'}, 'CancellationReasons': reasons},
+                'TransactWriteItems'
+            )
+        return {}
+
+
+def sqs_record(message_id, area_id, action='enter', count=1):
+    """SQS message for process_records"""
+    return {
+        'messageId': message_id,
+        'body': '{"area_id": "%s", "action": "%s", "count": %d}' % (area_id, action, count),
+        'attributes': {'SentTimestamp': '1700000000000'}
+    }
+
+
+class TestProcessRecords:
+    """Test suite for batched Lambda updates (stubbed DynamoDB client)"""
+    
+    @pytest.fixture
+    def stub(self, monkeypatch):
+        stub = StubTransactClient()
+        monkeypatch.setattr(capacity_updater, 'client', stub)
+        monkeypatch.setattr(capacity_updater, 'COUNTER_SHARDS', 1)
+        monkeypatch.setattr(capacity_updater, '_known_areas', set())
+        return stub
+    
+    def test_cancelled_exit_is_clamped(self, stub):
+        """An exit cancelled by its condition should be written again as a clamp"""
+        stub.cancel_reasons = [{'Code': 'ConditionalCheckFailed'}]
+        
+        result = capacity_updater.process_records([sqs_record('m1', 'pool', 'exit', 3)], 0)
+        
+        assert result == {'batchItemFailures': []}
+        assert len(stub.calls) == 2
+        (first,), token = stub.calls[0]
+        (retry,), retry_token = stub.calls[1]
+        assert first['Update']['ConditionExpression'] == "current_count >= :dec"
+        assert retry['Update']['UpdateExpression'].startswith("SET current_count = :zero")
+        assert retry_token and retry_token != token
+    
+    def test_failed_chunk_reports_only_its_messages(self, stub):
+        """Only the messages of a failed transaction should be retried"""
+        area_ids = [f"area{i}" for i in range(101)]
+        stub.areas.update(area_ids)
+        stub.fail_areas = {'area100'}
+        records = [sqs_record(f"m{i}", a) for i, a in enumerate(area_ids)]
+        
+        result = capacity_updater.process_records(records, 0)
+        
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'm100'}]}
+        assert [len(items) for items, _ in stub.calls] == [100, 1]
+    
+    def test_same_messages_use_same_token(self, stub):
+        """A redelivered batch should reuse its ClientRequestToken"""
+        records = [sqs_record('m1', 'pool'), sqs_record('m2', 'pool', 'exit')]
+        
+        capacity_updater.process_records(records, 0)
+        capacity_updater.process_records(records[::-1], 0)
+        capacity_updater.process_records(records[:1], 0)
+        
+        tokens = [token for _, token in stub.calls]
+        assert tokens[0] == tokens[1]
+        assert tokens[2] != tokens[0]
+    
+    def test_invalid_records_are_dropped(self, stub):
+        """Invalid records should be logged and dropped, not retried"""
+        records = [
+            {'messageId': 'bad-json', 'body': '{not json'},
+            sqs_record('bad-count', 'pool', count=0),
+            sqs_record('unknown', 'nowhere'),
+            sqs_record('m1', 'pool')
+        ]
+        
+        result = capacity_updater.process_records(records, 0)
+        
+        assert result == {'batchItemFailures': [{'itemIdentifier': 'unknown'}]}
+        assert len(stub.calls) == 1
+
+
 class TestDataModels:
     """Test suite for Pydantic data models"""
     
@@ -239,6 +679,32 @@ class TestDataModels:
                 area_id="test-area",
                 action="invalid"
             )
+    
+    def test_validate_update_request_matches_model(self):
+        """validate_update_request should accept and reject like the model"""
+        accepted = [
+            {"area_id": "pool", "action": "enter"},
+            {"area_id": "pool", "action": "EXIT", "count": 10},
+            {"area_id": "pool", "action": "enter", "count": "3"},
+            {"area_id": "pool", "action": "enter", "count": 3.0},
+            {"area_id": "pool", "action": "enter", "timestamp": "2024-02-07T14:30:00Z"}
+        ]
+        for raw in accepted:
+            expected = UpdateCapacityRequest.model_validate(raw)
+            assert validate_update_request(raw).model_dump() == expected.model_dump()
+        
+        rejected = [
+            {"action": "enter"},
+            {"area_id": "pool", "action": "jump"},
+            {"area_id": "pool", "action": "enter", "count": 0},
+            {"area_id": "pool", "action": "enter", "count": 3.5},
+            {"area_id": 5, "action": "enter"},
+            {"area_id": "pool", "action": "enter", "timestamp": 5},
+            ["pool", "enter"]
+        ]
+        for raw in rejected:
+            with pytest.raises(ValidationError):
+                validate_update_request(raw)
 
 
 class TestCORS: